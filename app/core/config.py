@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Optional
 
 class Settings(BaseSettings):
     app_name: str = "FastAPI Learning Project"
@@ -7,12 +8,47 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = True
     
-    # Database settings - using SQLite for easy setup
+    # Database settings - using SQLite for easy setup; "memory://" keeps items in process
     database_url: str = Field(
         default="sqlite:///./fastapi_items.db",
         description="Database URL"
     )
     
+    # memory:// only: loaded on startup if present, written on shutdown
+    memory_snapshot_path: Optional[str] = Field(default=None, description="Snapshot file for the in-memory store")
+    
+    # Bulk endpoints write in chunks of this many rows per statement
+    bulk_chunk_size: int = Field(default=500, ge=1, description="Rows per bulk write statement")
+    
+    # Exports fetch rows from the database cursor this many at a time
+    export_batch_size: int = Field(default=1000, ge=1, description="Rows fetched per export batch")
+    
+    # Read-through cache for GET /items/{item_id}; a size of 0 disables it
+    item_cache_size: int = Field(default=1024, ge=0, description="Maximum cached items")
+    item_cache_ttl: float = Field(default=60.0, gt=0, description="Seconds a cached item stays fresh")
+
+    # Cached list/search responses, retired by writes to the tables they read; 0 disables
+    response_cache_size: int = Field(default=2048, ge=0, description="Maximum cached responses")
+    response_cache_ttl: float = Field(default=30.0, gt=0, description="Seconds a cached response stays fresh")
+
+    # Production SQLite: WAL journal, a pool of read-only connections and a single
+    # writer thread that commits concurrent writes together
+    sqlite_production_mode: bool = Field(default=False, description="Enable WAL and group-commit writes on SQLite")
+    sqlite_read_pool_size: int = Field(default=8, ge=1, description="Read-only SQLite connections")
+    sqlite_group_commit_max: int = Field(default=64, ge=1, description="Most writes committed in one transaction")
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0, description="How long a connection waits on a lock")
+
+    # What startup does to the database: "migrate" runs the schema upgrade, "check"
+    # only verifies the recorded schema version, "skip" doesn't connect at all
+    startup_mode: str = Field(default="migrate", pattern="^(migrate|check|skip)$", description="Schema work on startup")
+
+    # Precomputed OpenAPI schema (python -m app.openapi PATH), served instead of
+    # building one from the routes
+    openapi_path: Optional[str] = Field(default=None, description="OpenAPI schema file")
+
+    # Add a Server-Timing header with SQL count and time to every response
+    server_timing: bool = Field(default=False, description="Send Server-Timing response headers")
+    
     class Config:
         env_file = ".env"
 
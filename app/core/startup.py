@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Cold-start accounting. The report is created before the application modules
+# are imported, so the first phase covers imports and route registration; the
+# last one ends when the first HTTP request arrives.
+
+class StartupReport:
+    """Time spent in each startup phase, and time to the first request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: List[Tuple[str, float]] = []
+        self.ready: Optional[float] = None
+        self.first_request: Optional[float] = None
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def finish(self) -> None:
+        self.ready = time.perf_counter() - self.started
+        logger.info(
+            "Started in %.1f ms (%s)", self.ready * 1000,
+            ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in self.phases)
+        )
+
+    def request_received(self) -> None:
+        self.first_request = time.perf_counter() - self.started
+        logger.info("First request %.1f ms after start", self.first_request * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": {phase: seconds for phase, seconds in self.phases},
+            "ready_seconds": self.ready,
+            "first_request_seconds": self.first_request,
+        }
+
+class FirstRequestMiddleware:
+    """Tell the startup report when the first HTTP request comes in."""
+
+    def __init__(self, app: ASGIApp, report: StartupReport):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.report.first_request is None:
+            self.report.request_received()
+        await self.app(scope, receive, send)
+
+def write_openapi(app: FastAPI, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(app.openapi(), f)
+
+def use_precomputed_openapi(app: FastAPI, path: Optional[str]) -> None:
+    """Serve the OpenAPI schema from `path` instead of building it from the routes.
+
+    A missing file, or one written for another version of the app, falls back
+    to FastAPI's own generation.
+    """
+    if not path or not os.path.exists(path):
+        return
+    with open(path) as f:
+        schema = json.load(f)
+    if schema.get("info", {}).get("version") != app.version:
+        logger.warning("Ignoring OpenAPI schema in %s: written for another version", path)
+        return
+    app.openapi_schema = schema
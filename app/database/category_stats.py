@@ -0,0 +1,127 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Per-category item count and price summary, maintained by triggers on `items`
+# so every write path (single, bulk, raw SQL) keeps it current. Inserts fold the
+# new price in directly; deletes and moves recompute min/max for the one category
+# they touch, which is an index seek on (category, price).
+
+SQLITE_TRIGGERS = {
+    "items_category_stats_ai": """
+    CREATE TRIGGER items_category_stats_ai AFTER INSERT ON items
+    WHEN new.category IS NOT NULL BEGIN
+        INSERT INTO category_stats (category, item_count, price_sum, min_price, max_price)
+        VALUES (new.category, 1, new.price, new.price, new.price)
+        ON CONFLICT (category) DO UPDATE SET
+            item_count = item_count + 1,
+            price_sum = price_sum + excluded.price_sum,
+            min_price = min(min_price, excluded.min_price),
+            max_price = max(max_price, excluded.max_price);
+    END
+    """,
+    "items_category_stats_ad": """
+    CREATE TRIGGER items_category_stats_ad AFTER DELETE ON items
+    WHEN old.category IS NOT NULL BEGIN
+        UPDATE category_stats SET
+            item_count = item_count - 1,
+            price_sum = price_sum - old.price,
+            min_price = (SELECT min(price) FROM items WHERE category = old.category),
+            max_price = (SELECT max(price) FROM items WHERE category = old.category)
+        WHERE category = old.category;
+        DELETE FROM category_stats WHERE category = old.category AND item_count <= 0;
+    END
+    """,
+    # An update is a removal from the old category plus an insert into the new one
+    "items_category_stats_au_old": """
+    CREATE TRIGGER items_category_stats_au_old AFTER UPDATE OF category, price ON items
+    WHEN old.category IS NOT NULL BEGIN
+        UPDATE category_stats SET
+            item_count = item_count - 1,
+            price_sum = price_sum - old.price,
+            min_price = (SELECT min(price) FROM items WHERE category = old.category),
+            max_price = (SELECT max(price) FROM items WHERE category = old.category)
+        WHERE category = old.category;
+        DELETE FROM category_stats WHERE category = old.category AND item_count <= 0;
+    END
+    """,
+    "items_category_stats_au_new": """
+    CREATE TRIGGER items_category_stats_au_new AFTER UPDATE OF category, price ON items
+    WHEN new.category IS NOT NULL BEGIN
+        INSERT INTO category_stats (category, item_count, price_sum, min_price, max_price)
+        VALUES (new.category, 1, new.price, new.price, new.price)
+        ON CONFLICT (category) DO UPDATE SET
+            item_count = item_count + 1,
+            price_sum = price_sum + excluded.price_sum,
+            min_price = min(min_price, excluded.min_price),
+            max_price = max(max_price, excluded.max_price);
+    END
+    """,
+}
+
+POSTGRES_FUNCTION = """
+CREATE OR REPLACE FUNCTION items_category_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.category IS NOT NULL THEN
+        UPDATE category_stats SET
+            item_count = item_count - 1,
+            price_sum = price_sum - OLD.price,
+            min_price = (SELECT min(price) FROM items WHERE category = OLD.category),
+            max_price = (SELECT max(price) FROM items WHERE category = OLD.category)
+        WHERE category = OLD.category;
+        DELETE FROM category_stats WHERE category = OLD.category AND item_count <= 0;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.category IS NOT NULL THEN
+        INSERT INTO category_stats (category, item_count, price_sum, min_price, max_price)
+        VALUES (NEW.category, 1, NEW.price, NEW.price, NEW.price)
+        ON CONFLICT (category) DO UPDATE SET
+            item_count = category_stats.item_count + 1,
+            price_sum = category_stats.price_sum + EXCLUDED.price_sum,
+            min_price = LEAST(category_stats.min_price, EXCLUDED.min_price),
+            max_price = GREATEST(category_stats.max_price, EXCLUDED.max_price);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+POSTGRES_TRIGGER = """
+CREATE TRIGGER items_category_stats
+AFTER INSERT OR DELETE OR UPDATE OF category, price ON items
+FOR EACH ROW EXECUTE FUNCTION items_category_stats()
+"""
+
+def install_category_stats(conn: Connection) -> None:
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        existing = set(conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'items_category_stats_%'")
+        ).scalars())
+        for name, statement in SQLITE_TRIGGERS.items():
+            if name not in existing:
+                conn.execute(text(statement))
+        installed = not existing
+
+    elif dialect == "postgresql":
+        conn.execute(text(POSTGRES_FUNCTION))
+        installed = conn.execute(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = 'items_category_stats'")
+        ).first() is None
+        if installed:
+            conn.execute(text(POSTGRES_TRIGGER))
+
+    else:
+        return
+
+    # First install: seed the summary from whatever is already in items
+    if installed:
+        rebuild_category_stats(conn)
+
+def rebuild_category_stats(conn: Connection) -> None:
+    conn.execute(text("DELETE FROM category_stats"))
+    conn.execute(text("""
+        INSERT INTO category_stats (category, item_count, price_sum, min_price, max_price)
+        SELECT category, count(*), sum(price), min(price), max(price)
+        FROM items WHERE category IS NOT NULL
+        GROUP BY category
+    """))
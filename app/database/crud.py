@@ -1,12 +1,97 @@
+import asyncio
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional
+from sqlalchemy import desc, func, tuple_, select, insert, update, delete, case, cast, literal, Float, Integer
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Sequence, TypeVar
 from datetime import datetime
 
-from .database import ItemDB
-from ..models.item import Item, ItemUpdate
+from .database import (
+    ItemDB, CategoryStatsDB, ITEM_COLUMNS, DBSession, SessionLocal, AsyncSessionLocal, IS_ASYNC,
+    IS_MEMORY, after_commit, writer,
+)
+from .fake_db import FakeDatabase, MemoryItemCRUD, fake_items_db
+from .fulltext import ranked_search
+from .cache import LRUCache, table_generations
+from .stats import STATS_PERCENTILES, nearest_rank, empty_stats, histogram_buckets
+from ..core.config import settings
+from ..models.item import Item, ItemUpdate, ItemBulkUpdate
+
+T = TypeVar("T")
+
+def _chunks(rows: Sequence[T], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _filter_items(
+    query,
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_total_price: Optional[float] = None,
+    max_total_price: Optional[float] = None
+):
+    # Works on both ORM queries and Core selects
+    if category:
+        query = query.where(ItemDB.category == category)
+    
+    if min_price is not None:
+        query = query.where(ItemDB.price >= min_price)
+        
+    if max_price is not None:
+        query = query.where(ItemDB.price <= max_price)
+    
+    if min_total_price is not None:
+        query = query.where(ItemDB.total_price >= min_total_price)
+    
+    if max_total_price is not None:
+        query = query.where(ItemDB.total_price <= max_total_price)
+    
+    return query
+
+# ?sort= values and the indexed column behind each; a leading "-" sorts descending
+SORT_COLUMNS = {
+    "price": ItemDB.price,
+    "total_price": ItemDB.total_price,
+    "created_at": ItemDB.created_at,
+    "name": ItemDB.name,
+}
+
+# ITEM_COLUMNS for RETURNING clauses. SQLite returns what it was given rather
+# than the stored REAL, so whole-number floats would come back as integers
+_RETURNING_COLUMNS = tuple(
+    cast(column, Float).label(column.key) if isinstance(column.type, Float) else column
+    for column in ITEM_COLUMNS
+)
+
+
+def _item_columns(fields: Optional[Sequence[str]], *keys: str) -> Tuple:
+    """ITEM_COLUMNS narrowed to a sparse fieldset plus the keys the cursor needs."""
+    if fields is None:
+        return ITEM_COLUMNS
+    wanted = {*fields, *keys}
+    return tuple(column for column in ITEM_COLUMNS if column.key in wanted)
+
+def sort_key(sort: Optional[str]) -> Tuple[str, ...]:
+    """Fields a keyset cursor for this sort order is made of."""
+    if not sort:
+        return ("id",)
+    return (sort.lstrip("-"), "id")
+
+def _floor(expression, dialect: str):
+    # CAST truncates on SQLite (fine for the non-negative offsets used here) but
+    # rounds on Postgres, which has floor()
+    if dialect == "sqlite":
+        return cast(expression, Integer)
+    return cast(func.floor(expression), Integer)
 
 class ItemCRUD:
+    def __init__(self, cache: Optional[LRUCache] = None):
+        # Optional read-through cache for get_item; None disables it
+        self.cache = cache
+
     def get_all_items(
         self, 
         db: Session, 
@@ -14,76 +99,482 @@ class ItemCRUD:
         limit: int = 100, 
         category: Optional[str] = None,
         min_price: Optional[float] = None,
-        max_price: Optional[float] = None
-    ) -> List[ItemDB]:
-        query = db.query(ItemDB)
+        max_price: Optional[float] = None,
+        min_total_price: Optional[float] = None,
+        max_total_price: Optional[float] = None,
+        sort: Optional[str] = None,
+        after: Optional[Tuple] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        query = _filter_items(
+            select(*_item_columns(fields, *sort_key(sort))),
+            category, min_price, max_price, min_total_price, max_total_price
+        )
         
-        if category:
-            query = query.filter(ItemDB.category == category)
+        # Order by (sort column, id) so filtered and sorted pages walk an index, e.g.
+        # (category, price, id), and can be resumed with a keyset cursor
+        keys = [ItemDB.id]
+        if sort:
+            keys.insert(0, SORT_COLUMNS[sort.lstrip("-")])
+        descending = bool(sort) and sort.startswith("-")
         
-        if min_price is not None:
-            query = query.filter(ItemDB.price >= min_price)
-            
-        if max_price is not None:
-            query = query.filter(ItemDB.price <= max_price)
+        query = query.order_by(*(key.desc() if descending else key for key in keys))
+        
+        # Keyset pagination: seek past the last key instead of counting rows with OFFSET
+        if after is not None:
+            if descending:
+                query = query.where(tuple_(*keys) < tuple_(*after))
+            else:
+                query = query.where(tuple_(*keys) > tuple_(*after))
+        else:
+            query = query.offset(skip)
         
-        return query.offset(skip).limit(limit).all()
+        return db.execute(query.limit(limit)).all()
+
+    def export_statement(
+        self,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        batch_size: int = 1000
+    ) -> Select:
+        # Plain rows in id order through a server-side cursor (yield_per), no identity map
+        return _filter_items(
+            select(*ITEM_COLUMNS), category, min_price, max_price
+        ).order_by(ItemDB.id).execution_options(yield_per=batch_size)
+
+    def iter_items(self, db: Session, **filters) -> Iterator[List[Row]]:
+        """Stream matching rows batch_size at a time; memory stays flat however many match."""
+        yield from db.execute(self.export_statement(**filters)).partitions()
 
     def get_item_by_id(self, db: Session, item_id: int) -> Optional[ItemDB]:
         return db.query(ItemDB).filter(ItemDB.id == item_id).first()
 
-    def create_item(self, db: Session, item: Item) -> ItemDB:
-        db_item = ItemDB(
-            name=item.name,
-            description=item.description,
-            price=item.price,
-            tax=item.tax or 0.0,
-            category=item.category,
-            created_at=datetime.utcnow()
-        )
-        db.add(db_item)
+    def get_item(self, db: Session, item_id: int) -> Optional[Row]:
+        """Read-only lookup as a plain row, served from the cache when possible."""
+        if self.cache is not None:
+            row = self.cache.get(item_id)
+            if row is not None:
+                return row
+            generation = self.cache.generation
+        
+        row = db.execute(select(*ITEM_COLUMNS).where(ItemDB.id == item_id)).first()
+        
+        # Misses aren't cached, so creating an item never needs an invalidation
+        if self.cache is not None and row is not None:
+            self.cache.set(item_id, row, generation)
+        return row
+
+    def get_items(self, db: Session, item_ids: Sequence[int]) -> Dict[int, Row]:
+        """Rows for the given ids, keyed by id; missing ids are left out.
+
+        Cached rows are used as-is and the rest are read with one IN (...) query.
+        """
+        rows, wanted = {}, set(item_ids)
+        if self.cache is not None:
+            for item_id in wanted:
+                row = self.cache.get(item_id)
+                if row is not None:
+                    rows[item_id] = row
+            wanted -= rows.keys()
+            generation = self.cache.generation
+        
+        if wanted:
+            for row in db.execute(select(*ITEM_COLUMNS).where(ItemDB.id.in_(wanted))):
+                rows[row.id] = row
+                if self.cache is not None:
+                    self.cache.set(row.id, row, generation)
+        return rows
+
+    def get_item_version(self, db: Session, item_id: int) -> Optional[datetime]:
+        """When the item last changed, for conditional GETs; None if it doesn't exist.
+
+        Reads only the timestamp columns (or a cached row), never the item body.
+        """
+        if self.cache is not None:
+            row = self.cache.get(item_id)
+            if row is not None:
+                return row.updated_at or row.created_at
+        
+        return db.execute(
+            select(func.coalesce(ItemDB.updated_at, ItemDB.created_at)).where(ItemDB.id == item_id)
+        ).scalar()
+
+    def _invalidate(self, db: Session, *item_ids: int) -> None:
+        # Drop the changed items from the item cache and move the items generation
+        # on, which retires every cached list/search response
+        def invalidate() -> None:
+            if self.cache is not None:
+                for item_id in item_ids:
+                    self.cache.invalidate(item_id)
+            table_generations.bump("items")
+
+        after_commit(db, invalidate)
+
+    # Single writes are one statement each: INSERT/UPDATE/DELETE ... RETURNING
+    # hands back the row in ITEM_COLUMNS form, so there is no SELECT before the
+    # write to find the row and none after it to refresh it
+
+    def create_item(self, db: Session, item: Item) -> Row:
+        row = db.execute(
+            insert(ItemDB).values(
+                name=item.name,
+                description=item.description,
+                price=item.price,
+                tax=item.tax or 0.0,
+                category=item.category,
+                created_at=datetime.utcnow()
+            ).returning(*_RETURNING_COLUMNS)
+        ).one()
+        db.commit()
+        self._invalidate(db)
+        return row
+
+    def update_item(self, db: Session, item_id: int, item_update: ItemUpdate) -> Optional[Row]:
+        row = db.execute(
+            update(ItemDB)
+            .where(ItemDB.id == item_id)
+            .values(**item_update.model_dump(exclude_unset=True), updated_at=datetime.utcnow())
+            .returning(*_RETURNING_COLUMNS),
+            execution_options={"synchronize_session": False}
+        ).first()
+        if row is None:
+            return None
+        
         db.commit()
-        db.refresh(db_item)
-        return db_item
+        self._invalidate(db, item_id)
+        return row
 
-    def update_item(self, db: Session, item_id: int, item_update: ItemUpdate) -> Optional[ItemDB]:
-        db_item = self.get_item_by_id(db, item_id)
-        if not db_item:
+    def delete_item(self, db: Session, item_id: int) -> Optional[Row]:
+        row = db.execute(
+            delete(ItemDB).where(ItemDB.id == item_id).returning(*_RETURNING_COLUMNS),
+            execution_options={"synchronize_session": False}
+        ).first()
+        if row is None:
             return None
         
-        update_data = item_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_item, field, value)
+        db.commit()
+        self._invalidate(db, item_id)
+        return row
+
+    def bulk_create_items(self, db: Session, items: Sequence[Item], chunk_size: int) -> List[int]:
+        """Insert all items in one transaction, one executemany per chunk."""
+        created_at = datetime.utcnow()
+        statement = insert(ItemDB).returning(ItemDB.id, sort_by_parameter_order=True)
+        item_ids = []
+        
+        for chunk in _chunks(items, chunk_size):
+            rows = [
+                {
+                    "name": item.name,
+                    "description": item.description,
+                    "price": item.price,
+                    "tax": item.tax or 0.0,
+                    "category": item.category,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+                for item in chunk
+            ]
+            item_ids.extend(db.execute(statement, rows).scalars().all())
         
-        db_item.updated_at = datetime.utcnow()
         db.commit()
-        db.refresh(db_item)
-        return db_item
+        self._invalidate(db)
+        return item_ids
 
-    def delete_item(self, db: Session, item_id: int) -> Optional[ItemDB]:
-        db_item = self.get_item_by_id(db, item_id)
-        if db_item:
-            db.delete(db_item)
-            db.commit()
-            return db_item
-        return None
+    def bulk_update_items(
+        self,
+        db: Session,
+        updates: Sequence[ItemBulkUpdate],
+        chunk_size: int
+    ) -> Tuple[List[int], List[int]]:
+        """Apply partial updates by primary key in one transaction.
+
+        Returns (updated_ids, missing_ids); rows for missing ids are skipped.
+        """
+        updated_at = datetime.utcnow()
+        updated_ids, missing_ids = [], []
+        
+        for chunk in _chunks(updates, chunk_size):
+            existing = set(db.scalars(
+                select(ItemDB.id).where(ItemDB.id.in_([row.id for row in chunk]))
+            ))
+            rows = []
+            for row in chunk:
+                if row.id not in existing:
+                    missing_ids.append(row.id)
+                    continue
+                rows.append({**row.model_dump(exclude_unset=True), "updated_at": updated_at})
+                updated_ids.append(row.id)
+            
+            if rows:
+                db.execute(update(ItemDB), rows)
+        
+        db.commit()
+        self._invalidate(db, *updated_ids)
+        return updated_ids, missing_ids
+
+    def bulk_delete_items(
+        self,
+        db: Session,
+        item_ids: Sequence[int],
+        chunk_size: int
+    ) -> Tuple[List[int], List[int]]:
+        """Delete by primary key in one transaction; returns (deleted_ids, missing_ids)."""
+        deleted_ids, missing_ids = [], []
+        
+        for chunk in _chunks(item_ids, chunk_size):
+            existing = set(db.scalars(select(ItemDB.id).where(ItemDB.id.in_(chunk))))
+            for item_id in chunk:
+                (deleted_ids if item_id in existing else missing_ids).append(item_id)
+            
+            if existing:
+                db.execute(
+                    delete(ItemDB).where(ItemDB.id.in_(existing)),
+                    execution_options={"synchronize_session": False}
+                )
+        
+        db.commit()
+        self._invalidate(db, *deleted_ids)
+        return deleted_ids, missing_ids
 
     def get_categories(self, db: Session) -> List[str]:
-        categories = db.query(ItemDB.category).filter(ItemDB.category.isnot(None)).distinct().all()
-        return [cat[0] for cat in categories if cat[0]]
+        # Served from the trigger-maintained summary instead of a DISTINCT scan of items
+        categories = db.query(CategoryStatsDB.category).filter(
+            CategoryStatsDB.item_count > 0
+        ).order_by(CategoryStatsDB.category).all()
+        return [cat[0] for cat in categories]
+
+    def get_category_stats(self, db: Session) -> List[CategoryStatsDB]:
+        return db.query(CategoryStatsDB).filter(
+            CategoryStatsDB.item_count > 0
+        ).order_by(CategoryStatsDB.category).all()
+
+    def get_category_summary(self, db: Session, category: str) -> Optional[CategoryStatsDB]:
+        return db.query(CategoryStatsDB).filter(
+            CategoryStatsDB.category == category,
+            CategoryStatsDB.item_count > 0
+        ).first()
+
+    def get_item_stats(
+        self,
+        db: Session,
+        by_category: bool = False,
+        buckets: int = 10,
+        histogram: str = "price"
+    ) -> List[Dict[str, Any]]:
+        """Count, price/total price summaries and a histogram, computed in SQL.
+
+        Returns the overall stats first, then one entry per category if
+        by_category. Each scope costs the same four statements however many
+        categories there are: the aggregates, one row_number() pass per field
+        for the percentiles, and a GROUP BY over floor-computed buckets.
+        """
+        scopes = [None] + (self.get_categories(db) if by_category else [])
+        stats = {category: empty_stats(category) for category in scopes}
+        columns = {"price": ItemDB.price, "total_price": cast(ItemDB.total_price, Float)}
+        # Ranked by the bare indexed columns; a CAST would make SQLite sort instead of scanning the index
+        rank_order = {"price": (ItemDB.price, ItemDB.id), "total_price": (ItemDB.total_price, ItemDB.id)}
+        dialect = db.get_bind().dialect.name
+        
+        for grouped in (False, True) if by_category else (False,):
+            key = [ItemDB.category] if grouped else []
+            
+            def scoped(query):
+                return query.where(ItemDB.category.isnot(None)) if grouped else query
+            
+            aggregates = scoped(select(
+                *key,
+                func.count(),
+                func.avg(func.coalesce(ItemDB.tax, 0)),
+                *(aggregate(column) for column in columns.values() for aggregate in (func.min, func.max, func.avg))
+            ))
+            if grouped:
+                aggregates = aggregates.group_by(ItemDB.category)
+            
+            ranks = {}
+            for row in db.execute(aggregates):
+                category = row[0] if grouped else None
+                count, avg_tax, *values = row[1:] if grouped else row
+                entry = stats[category]
+                entry.update(count=count, avg_tax=avg_tax)
+                if count:
+                    for index, field in enumerate(columns):
+                        low, high, avg = values[index * 3:index * 3 + 3]
+                        entry[field] = {
+                            "min": low,
+                            "max": high,
+                            "avg": avg,
+                            "percentiles": {f"p{percentile}": None for percentile in STATS_PERCENTILES},
+                        }
+                    # Small groups can map several percentiles to the same row
+                    for percentile in STATS_PERCENTILES:
+                        ranks.setdefault((category, nearest_rank(count, percentile)), []).append(percentile)
+            
+            if not ranks:
+                continue
+            
+            # Percentiles: number the rows in value order once and pick the wanted ranks
+            for field, column in columns.items():
+                ranked = scoped(select(
+                    *key,
+                    column.label("value"),
+                    func.row_number().over(partition_by=key or None, order_by=rank_order[field]).label("rank")
+                )).subquery()
+                if grouped:
+                    wanted = tuple_(ranked.c.category, ranked.c.rank).in_(list(ranks))
+                    picked = select(ranked.c.category, ranked.c.rank, ranked.c.value)
+                else:
+                    wanted = ranked.c.rank.in_([rank for _, rank in ranks])
+                    picked = select(literal(None), ranked.c.rank, ranked.c.value)
+                for category, rank, value in db.execute(picked.where(wanted)):
+                    for percentile in ranks[(category, rank)]:
+                        stats[category][field]["percentiles"][f"p{percentile}"] = value
+            
+            # Histogram over the overall range, so buckets line up across categories
+            overall = stats[None][histogram]
+            if overall is None:
+                continue
+            low, width = overall["min"], (overall["max"] - overall["min"]) / buckets
+            bucket = literal(0) if width == 0 else _floor((columns[histogram] - low) / width, dialect)
+            bucket = case((bucket >= buckets, buckets - 1), else_=bucket).label("bucket")
+            counts = scoped(select(*key, bucket, func.count())).group_by(*key, bucket)
+            
+            for row in db.execute(counts):
+                category, index, count = row if grouped else (None, *row)
+                entry = stats[category]
+                if not entry["histogram"]:
+                    entry["histogram"] = histogram_buckets(low, width, buckets if width else 1)
+                entry["histogram"][int(index)]["count"] = count
+        
+        return [stats[category] for category in scopes]
 
     def search_items(
         self, 
         db: Session, 
         query: str, 
         skip: int = 0, 
-        limit: int = 100
-    ) -> List[ItemDB]:
-        search = f"%{query.lower()}%"
-        return db.query(ItemDB).filter(
-            (ItemDB.name.ilike(search)) | 
-            (ItemDB.description.ilike(search))
-        ).offset(skip).limit(limit).all()
+        limit: int = 100,
+        after: Optional[Tuple[float, int]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """Full-text search, best matches first; rows carry a `score` after the item columns."""
+        search = ranked_search(db, query, _item_columns(fields, "id"))
+        if search is None:
+            return []
+        
+        results, score = search
+        results = results.order_by(score, ItemDB.id)
+        
+        if after is not None:
+            results = results.where(tuple_(score, ItemDB.id) > tuple_(*after))
+        else:
+            results = results.offset(skip)
+        
+        return db.execute(results.limit(limit)).all()
+
+class AsyncItemCRUD:
+    """Awaitable front for ItemCRUD, used by the routers.
+
+    On an AsyncSession (aiosqlite/asyncpg) each call runs ItemCRUD's code through
+    AsyncSession.run_sync, so the same statements execute on the async driver
+    without blocking the event loop or using a thread. On a plain Session the
+    call is handed to the threadpool, exactly as a sync route would be. Either
+    way both modes share one query implementation and return identical results.
+    """
+
+    def __init__(self, crud: ItemCRUD):
+        self.crud = crud
+
+    @property
+    def cache(self) -> Optional[LRUCache]:
+        return self.crud.cache
+
+    async def _run(self, db: DBSession, method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if isinstance(db, AsyncSession):
+            return await db.run_sync(method, *args, **kwargs)
+        # In-memory lookups never wait on I/O, so a thread hop would only add latency
+        if isinstance(db, FakeDatabase):
+            return method(db, *args, **kwargs)
+        return await run_in_threadpool(method, db, *args, **kwargs)
+
+    async def _write(self, db: DBSession, method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # In SQLite production mode writes go through the group-commit writer
+        # rather than the request's read-only session
+        if writer is not None:
+            return await asyncio.wrap_future(writer.submit(method, *args, **kwargs))
+        return await self._run(db, method, *args, **kwargs)
+
+    async def get_all_items(self, db: DBSession, **kwargs) -> List[Row]:
+        return await self._run(db, self.crud.get_all_items, **kwargs)
+
+    async def get_item(self, db: DBSession, item_id: int) -> Optional[Row]:
+        return await self._run(db, self.crud.get_item, item_id)
+
+    async def get_items(self, db: DBSession, item_ids: Sequence[int]) -> Dict[int, Row]:
+        return await self._run(db, self.crud.get_items, item_ids)
+
+    async def get_item_version(self, db: DBSession, item_id: int) -> Optional[datetime]:
+        return await self._run(db, self.crud.get_item_version, item_id)
+
+    async def create_item(self, db: DBSession, item: Item) -> Row:
+        return await self._write(db, self.crud.create_item, item)
+
+    async def update_item(self, db: DBSession, item_id: int, item_update: ItemUpdate) -> Optional[Row]:
+        return await self._write(db, self.crud.update_item, item_id, item_update)
+
+    async def delete_item(self, db: DBSession, item_id: int) -> Optional[Row]:
+        return await self._write(db, self.crud.delete_item, item_id)
+
+    async def bulk_create_items(self, db: DBSession, **kwargs) -> List[int]:
+        return await self._write(db, self.crud.bulk_create_items, **kwargs)
+
+    async def bulk_update_items(self, db: DBSession, **kwargs) -> Tuple[List[int], List[int]]:
+        return await self._write(db, self.crud.bulk_update_items, **kwargs)
+
+    async def bulk_delete_items(self, db: DBSession, **kwargs) -> Tuple[List[int], List[int]]:
+        return await self._write(db, self.crud.bulk_delete_items, **kwargs)
+
+    async def get_categories(self, db: DBSession) -> List[str]:
+        return await self._run(db, self.crud.get_categories)
+
+    async def get_category_stats(self, db: DBSession) -> List[CategoryStatsDB]:
+        return await self._run(db, self.crud.get_category_stats)
+
+    async def get_category_summary(self, db: DBSession, category: str) -> Optional[CategoryStatsDB]:
+        return await self._run(db, self.crud.get_category_summary, category)
+
+    async def get_item_stats(self, db: DBSession, **kwargs) -> List[Dict[str, Any]]:
+        return await self._run(db, self.crud.get_item_stats, **kwargs)
+
+    async def search_items(self, db: DBSession, **kwargs) -> List[Row]:
+        return await self._run(db, self.crud.search_items, **kwargs)
+
+    async def stream_items(self, **filters) -> AsyncIterator[List[Row]]:
+        # Streams outlive the request's dependencies, so each one owns its session
+        if IS_MEMORY:
+            for rows in self.crud.iter_items(fake_items_db, **filters):
+                yield rows
+        elif IS_ASYNC:
+            async with AsyncSessionLocal() as db:
+                result = await db.stream(self.crud.export_statement(**filters))
+                async for rows in result.partitions():
+                    yield rows
+        else:
+            db = SessionLocal()
+            try:
+                async for rows in iterate_in_threadpool(self.crud.iter_items(db, **filters)):
+                    yield rows
+            finally:
+                db.close()
 
 # Create CRUD instance
-item_crud = ItemCRUD()
+if IS_MEMORY:
+    item_crud = MemoryItemCRUD()
+else:
+    item_crud = ItemCRUD(
+        cache=LRUCache(max_size=settings.item_cache_size, ttl=settings.item_cache_ttl)
+        if settings.item_cache_size > 0 else None
+    )
+
+async_item_crud = AsyncItemCRUD(item_crud)
@@ -1,20 +1,107 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Text, Index, Computed, cast
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker, Session
+from typing import Callable, Union
 from datetime import datetime
 
 from ..core.config import settings
+from ..core.metrics import instrument_engine
+from .sqlite_writer import GroupCommitWriter
+from .fake_db import FakeDatabase, fake_items_db
 
 # Database setup
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
+# An async driver in the URL (sqlite+aiosqlite://, postgresql+asyncpg://) switches
+# request handling to AsyncSession. DDL and migrations always use the sync driver.
+ASYNC_DRIVERS = ("+aiosqlite", "+asyncpg")
+IS_ASYNC = any(driver in SQLALCHEMY_DATABASE_URL for driver in ASYNC_DRIVERS)
+
+SYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL
+for driver in ASYNC_DRIVERS:
+    SYNC_DATABASE_URL = SYNC_DATABASE_URL.replace(driver, "")
+
+# memory:// serves items from the indexed in-process store in fake_db.py; no SQL
+# engine is created
+IS_MEMORY = SQLALCHEMY_DATABASE_URL.startswith("memory://")
+
+# Production mode needs a database file shared between connections, and the
+# writer thread only serves sync sessions
+SQLITE_PRODUCTION = (
+    settings.sqlite_production_mode
+    and SYNC_DATABASE_URL.startswith("sqlite")
+    and ":memory:" not in SYNC_DATABASE_URL
+    and not IS_ASYNC
+)
+
 # SQLite needs check_same_thread=False
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+if IS_MEMORY:
+    engine = None
+elif SYNC_DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(SYNC_DATABASE_URL, connect_args={"check_same_thread": False})
 else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    engine = create_engine(SYNC_DATABASE_URL)
+
+if SQLITE_PRODUCTION:
+    # `engine` becomes the write side: migrations at startup, then the writer
+    # thread. pysqlite's own transaction handling can't do SAVEPOINT, so it is
+    # switched off and BEGIN IMMEDIATE takes the write lock up front.
+    @event.listens_for(engine, "connect")
+    def _writer_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _writer_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Requests read through their own pool; under WAL readers never block the
+    # writer or each other, and query_only rejects any stray write
+    read_engine = create_engine(
+        SYNC_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=0,
+    )
+
+    @event.listens_for(read_engine, "connect")
+    def _reader_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.close()
+
+    writer = GroupCommitWriter(engine, max_batch=settings.sqlite_group_commit_max)
+else:
+    read_engine = engine
+    writer = None
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+if IS_ASYNC:
+    async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+    # Rows are read after the session's greenlet returns, so don't expire them on commit
+    AsyncSessionLocal = sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+# Count statements and database time per request (see core/metrics.py)
+for instrumented in {engine, read_engine, async_engine and async_engine.sync_engine} - {None}:
+    instrument_engine(instrumented)
+
+# What get_db yields, depending on the configured driver
+DBSession = Union[Session, AsyncSession, FakeDatabase]
 
 Base = declarative_base()
 
@@ -27,17 +114,76 @@ class ItemDB(Base):
     description = Column(Text, nullable=True)
     price = Column(Float, nullable=False)
     tax = Column(Float, nullable=True, default=0.0)
+    # Generated by the database (STORED on Postgres, VIRTUAL on SQLite) so it can be indexed
+    total_price = Column(Float, Computed("price + coalesce(tax, 0)"))
     category = Column(String(50), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Every sortable column is indexed together with id, the keyset tie-breaker
+    __table_args__ = (
+        Index("ix_items_price_id", "price", "id"),
+        Index("ix_items_total_price_id", "total_price", "id"),
+        Index("ix_items_created_at_id", "created_at", "id"),
+        Index("ix_items_name_id", "name", "id"),
+        Index("ix_items_category_price_id", "category", "price", "id"),
+        Index("ix_items_category_total_price_id", "category", "total_price", "id"),
+    )
+
+# Plain-row projection of an item, in ItemResponse field order. Selecting these
+# table columns (rather than the ItemDB entity) returns lightweight Core rows
+# with no ORM identity map involved.
+_items = ItemDB.__table__
+ITEM_COLUMNS = (
+    _items.c.id,
+    _items.c.name,
+    _items.c.description,
+    _items.c.price,
+    _items.c.tax,
+    # SQLite can hand back a whole-number virtual column as an integer
+    cast(_items.c.total_price, Float).label("total_price"),
+    _items.c.category,
+    _items.c.created_at,
+    _items.c.updated_at,
+)
+
+class CategoryStatsDB(Base):
+    # Maintained by triggers on items, see category_stats.py
+    __tablename__ = "category_stats"
+
+    category = Column(String(50), primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0)
+    price_sum = Column(Float, nullable=False, default=0.0)
+    min_price = Column(Float, nullable=True)
+    max_price = Column(Float, nullable=True)
+
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+if IS_MEMORY:
+    def get_db():
+        yield fake_items_db
+elif IS_ASYNC:
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+else:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run callback once db's changes are durable.
+
+    Sessions handed out by the group-commit writer only release a savepoint on
+    commit(), so work that must follow the real commit is deferred until then.
+    """
+    pending = db.info.get("after_commit")
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
 
 # Create tables
 def create_tables():
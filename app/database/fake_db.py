@@ -1,36 +1,559 @@
-from typing import Dict, Any
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
 from datetime import datetime
+from heapq import nlargest, nsmallest
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import json
+import os
+import re
+import tempfile
+import threading
+
+from ..models.item import Item, ItemUpdate, ItemBulkUpdate
+from .cache import table_generations
+from .stats import STATS_PERCENTILES, nearest_rank, empty_stats, histogram_buckets
+
+# In-process item store behind database_url="memory://". Records are immutable
+# tuples shaped like the Core rows ItemCRUD returns, so routers, serialization
+# and exports treat both backends the same. Secondary indexes:
+#   - ids in ascending order (the default sort and the export order)
+#   - (price, id) pairs, sorted, for price ranges and ?sort=price
+#   - category -> sorted (price, id) pairs, the hash index for ?category= and
+#     the per-category summary (count, sum, min and max come straight off it)
+#   - token -> {id: weight} with a sorted vocabulary for prefix search
+
+class ItemRecord(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
+    tax: Optional[float]
+    total_price: float
+    category: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+class ScoredItemRecord(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
+    tax: Optional[float]
+    total_price: float
+    category: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    score: float
+
+class CategoryRecord(NamedTuple):
+    category: str
+    item_count: int
+    price_sum: float
+    min_price: float
+    max_price: float
+
+# Same tokenization and weights as the SQL full-text index (see fulltext.py)
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+SNAPSHOT_VERSION = 1
+
+def _tokens(text: Optional[str]) -> List[str]:
+    return re.findall(r"\w+", text.lower()) if text else []
+
+def _total_price(price: float, tax: Optional[float]) -> float:
+    return float(price + (tax or 0))
 
 class FakeDatabase:
     def __init__(self):
-        self.items_db: Dict[int, Any] = {}
+        self.items_db: Dict[int, ItemRecord] = {}
         self.item_counter: int = 1
-    
-    def get_all_items(self):
+        # Held by MemoryItemCRUD around every read and write
+        self.lock = threading.RLock()
+        self._ids: List[int] = []
+        self._by_price: List[Tuple[float, int]] = []
+        self._by_category: Dict[str, List[Tuple[float, int]]] = {}
+        self._price_sums: Dict[str, float] = {}
+        self._tokens: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+
+    def get_all_items(self) -> List[ItemRecord]:
         return list(self.items_db.values())
-    
-    def get_item(self, item_id: int):
+
+    def get_item(self, item_id: int) -> Optional[ItemRecord]:
         return self.items_db.get(item_id)
-    
-    def create_item(self, item_data: dict):
-        self.items_db[self.item_counter] = item_data
-        current_id = self.item_counter
-        self.item_counter += 1
-        return current_id
-    
-    def update_item(self, item_id: int, item_data: dict):
-        if item_id in self.items_db:
-            self.items_db[item_id] = item_data
+
+    def create_item(self, item_data: dict) -> int:
+        with self.lock:
+            current_id = self.item_counter
+            now = datetime.utcnow()
+            price, tax = item_data["price"], item_data.get("tax")
+            self._add(ItemRecord(
+                id=current_id,
+                name=item_data["name"],
+                description=item_data.get("description"),
+                price=price,
+                tax=tax,
+                total_price=_total_price(price, tax),
+                category=item_data.get("category"),
+                created_at=item_data.get("created_at") or now,
+                updated_at=item_data.get("updated_at") or now,
+            ))
+            self.item_counter += 1
+            table_generations.bump("items")
+            return current_id
+
+    def update_item(self, item_id: int, item_data: dict) -> bool:
+        """Apply a partial update; returns False if there is no such item."""
+        with self.lock:
+            record = self.items_db.get(item_id)
+            if record is None:
+                return False
+            record = record._replace(**item_data)
+            self._remove(item_id)
+            self._add(record._replace(total_price=_total_price(record.price, record.tax)))
+            table_generations.bump("items")
             return True
-        return False
-    
-    def delete_item(self, item_id: int):
-        return self.items_db.pop(item_id, None)
-    
-    def item_exists(self, item_id: int):
+
+    def delete_item(self, item_id: int) -> Optional[ItemRecord]:
+        with self.lock:
+            if item_id not in self.items_db:
+                return None
+            table_generations.bump("items")
+            return self._remove(item_id)
+
+    def item_exists(self, item_id: int) -> bool:
         return item_id in self.items_db
 
+    def clear(self) -> None:
+        with self.lock:
+            self.items_db.clear()
+            self.item_counter = 1
+            for index in (self._ids, self._by_price, self._by_category, self._price_sums, self._tokens, self._vocabulary):
+                index.clear()
+            table_generations.bump("items")
+
+    # Index maintenance
+
+    def _add(self, record: ItemRecord) -> None:
+        self.items_db[record.id] = record
+        insort(self._ids, record.id)
+        insort(self._by_price, (record.price, record.id))
+
+        if record.category is not None:
+            insort(self._by_category.setdefault(record.category, []), (record.price, record.id))
+            self._price_sums[record.category] = self._price_sums.get(record.category, 0.0) + record.price
+
+        for token, weight in self._weights(record).items():
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = {}
+                insort(self._vocabulary, token)
+            postings[record.id] = weight
+
+    def _remove(self, item_id: int) -> ItemRecord:
+        record = self.items_db.pop(item_id)
+        del self._ids[bisect_left(self._ids, item_id)]
+        del self._by_price[bisect_left(self._by_price, (record.price, item_id))]
+
+        if record.category is not None:
+            bucket = self._by_category[record.category]
+            del bucket[bisect_left(bucket, (record.price, item_id))]
+            if bucket:
+                self._price_sums[record.category] -= record.price
+            else:
+                del self._by_category[record.category]
+                del self._price_sums[record.category]
+
+        for token in self._weights(record):
+            postings = self._tokens[token]
+            del postings[item_id]
+            if not postings:
+                del self._tokens[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+        return record
+
+    @staticmethod
+    def _weights(record: ItemRecord) -> Counter:
+        weights: Counter = Counter()
+        for token in _tokens(record.name):
+            weights[token] += NAME_WEIGHT
+        for token in _tokens(record.description):
+            weights[token] += DESCRIPTION_WEIGHT
+        return weights
+
+    # Index lookups; callers hold the lock
+
+    def price_index(self, category: Optional[str] = None) -> List[Tuple[float, int]]:
+        """(price, id) pairs in order, for one category or for every item."""
+        if category:
+            return self._by_category.get(category, [])
+        return self._by_price
+
+    def id_index(self) -> List[int]:
+        return self._ids
+
+    def category_stats(self, category: str) -> Optional[CategoryRecord]:
+        bucket = self._by_category.get(category)
+        if not bucket:
+            return None
+        return CategoryRecord(
+            category=category,
+            item_count=len(bucket),
+            price_sum=self._price_sums[category],
+            min_price=bucket[0][0],
+            max_price=bucket[-1][0],
+        )
+
+    def categories(self) -> List[str]:
+        return sorted(self._by_category)
+
+    def match(self, terms: Sequence[str]) -> Dict[int, float]:
+        """Items containing a token starting with every term, mapped to their weight."""
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for index in range(bisect_left(self._vocabulary, term), len(self._vocabulary)):
+                token = self._vocabulary[index]
+                if not token.startswith(term):
+                    break
+                for item_id, weight in self._tokens[token].items():
+                    term_scores[item_id] = term_scores.get(item_id, 0.0) + weight
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    item_id: score + term_scores[item_id]
+                    for item_id, score in scores.items() if item_id in term_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+    # Snapshots
+
+    def save(self, path: str) -> None:
+        """Write every item to `path` as JSON, atomically replacing the old snapshot."""
+        with self.lock:
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "item_counter": self.item_counter,
+                "items": [
+                    {
+                        **record._asdict(),
+                        "created_at": record.created_at.isoformat(),
+                        "updated_at": record.updated_at.isoformat(),
+                    }
+                    for record in self.items_db.values()
+                ],
+            }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def load(self, path: str) -> None:
+        """Replace the store's contents with a snapshot written by save()."""
+        with open(path) as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+
+        with self.lock:
+            self.clear()
+            for item in snapshot["items"]:
+                item["created_at"] = datetime.fromisoformat(item["created_at"])
+                item["updated_at"] = datetime.fromisoformat(item["updated_at"])
+                self._add(ItemRecord(**item))
+            self.item_counter = snapshot["item_counter"]
+
 def get_current_timestamp():
     return datetime.now()
 
 fake_items_db = FakeDatabase()
+
+class MemoryItemCRUD:
+    """ItemCRUD over a FakeDatabase, with the same methods and return shapes.
+
+    Lookups that the SQL backend serves from an index are served from the
+    matching in-memory index: id and price orders seek with bisect, category
+    filters start from the category bucket, and search walks the token index.
+    """
+
+    # Nothing to cache in front of memory; here for /cache/stats
+    cache = None
+
+    def get_all_items(
+        self,
+        db: FakeDatabase,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_total_price: Optional[float] = None,
+        max_total_price: Optional[float] = None,
+        sort: Optional[str] = None,
+        after: Optional[Tuple] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[ItemRecord]:
+        # Records are shared, not copied, so a sparse fieldset is only applied
+        # when the response is serialized
+        field = sort.lstrip("-") if sort else "id"
+        descending = bool(sort) and sort.startswith("-")
+
+        def residual(record: ItemRecord) -> bool:
+            if min_total_price is not None and record.total_price < min_total_price:
+                return False
+            if max_total_price is not None and record.total_price > max_total_price:
+                return False
+            return True
+
+        with db.lock:
+            by_price = bool(category) or min_price is not None or max_price is not None
+
+            if field == "id" and not by_price:
+                # Walk the id index directly
+                index = db.id_index()
+                lo, hi = 0, len(index)
+                if after is not None:
+                    if descending:
+                        hi = bisect_left(index, after[0])
+                    else:
+                        lo = bisect_right(index, after[0])
+                positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+                records = (db.items_db[index[i]] for i in positions)
+                start = skip if after is None else 0
+                return list(islice(filter(residual, records), start, start + limit))
+
+            index = db.price_index(category)
+            lo = 0 if min_price is None else bisect_left(index, (min_price,))
+            hi = len(index) if max_price is None else bisect_right(index, (max_price, float("inf")))
+
+            if field == "price":
+                # The price index is already in (price, id) order
+                if after is not None:
+                    if descending:
+                        hi = min(hi, bisect_left(index, tuple(after)))
+                    else:
+                        lo = max(lo, bisect_right(index, tuple(after)))
+                positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+                records = (db.items_db[index[i][1]] for i in positions)
+                start = skip if after is None else 0
+                return list(islice(filter(residual, records), start, start + limit))
+
+            if by_price:
+                candidates = (db.items_db[index[i][1]] for i in range(lo, hi))
+            else:
+                candidates = iter(db.items_db.values())
+            candidates = filter(residual, candidates)
+
+            if field == "id":
+                key = lambda record: (record.id,)
+            else:
+                key = lambda record: (getattr(record, field), record.id)
+
+            if after is not None:
+                after = tuple(after)
+                if descending:
+                    candidates = (record for record in candidates if key(record) < after)
+                else:
+                    candidates = (record for record in candidates if key(record) > after)
+
+            start = skip if after is None else 0
+            pick = nlargest if descending else nsmallest
+            return pick(start + limit, candidates, key=key)[start:]
+
+    def iter_items(
+        self,
+        db: FakeDatabase,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[ItemRecord]]:
+        """Matching records in id order, batch_size at a time."""
+        with db.lock:
+            if category or min_price is not None or max_price is not None:
+                index = db.price_index(category)
+                lo = 0 if min_price is None else bisect_left(index, (min_price,))
+                hi = len(index) if max_price is None else bisect_right(index, (max_price, float("inf")))
+                records = sorted((db.items_db[item_id] for _, item_id in index[lo:hi]), key=lambda r: r.id)
+            else:
+                # items_db is in insertion order, and an update re-inserts the item
+                records = [db.items_db[item_id] for item_id in db.id_index()]
+
+        for start in range(0, len(records), batch_size):
+            yield records[start:start + batch_size]
+
+    def get_item_by_id(self, db: FakeDatabase, item_id: int) -> Optional[ItemRecord]:
+        return db.get_item(item_id)
+
+    def get_item(self, db: FakeDatabase, item_id: int) -> Optional[ItemRecord]:
+        return db.get_item(item_id)
+
+    def get_items(self, db: FakeDatabase, item_ids: Sequence[int]) -> Dict[int, ItemRecord]:
+        with db.lock:
+            return {item_id: db.items_db[item_id] for item_id in set(item_ids) if item_id in db.items_db}
+
+    def get_item_version(self, db: FakeDatabase, item_id: int) -> Optional[datetime]:
+        record = db.get_item(item_id)
+        return record.updated_at if record is not None else None
+
+    def create_item(self, db: FakeDatabase, item: Item) -> ItemRecord:
+        with db.lock:
+            item_id = db.create_item({
+                "name": item.name,
+                "description": item.description,
+                "price": item.price,
+                "tax": item.tax or 0.0,
+                "category": item.category,
+            })
+            return db.get_item(item_id)
+
+    def update_item(self, db: FakeDatabase, item_id: int, item_update: ItemUpdate) -> Optional[ItemRecord]:
+        update_data = item_update.model_dump(exclude_unset=True)
+        update_data["updated_at"] = datetime.utcnow()
+        with db.lock:
+            if not db.update_item(item_id, update_data):
+                return None
+            return db.get_item(item_id)
+
+    def delete_item(self, db: FakeDatabase, item_id: int) -> Optional[ItemRecord]:
+        return db.delete_item(item_id)
+
+    def bulk_create_items(self, db: FakeDatabase, items: Sequence[Item], chunk_size: int) -> List[int]:
+        created_at = datetime.utcnow()
+        with db.lock:
+            return [
+                db.create_item({
+                    "name": item.name,
+                    "description": item.description,
+                    "price": item.price,
+                    "tax": item.tax or 0.0,
+                    "category": item.category,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+                for item in items
+            ]
+
+    def bulk_update_items(
+        self,
+        db: FakeDatabase,
+        updates: Sequence[ItemBulkUpdate],
+        chunk_size: int
+    ) -> Tuple[List[int], List[int]]:
+        updated_at = datetime.utcnow()
+        updated_ids, missing_ids = [], []
+        with db.lock:
+            for row in updates:
+                changes = {**row.model_dump(exclude_unset=True, exclude={"id"}), "updated_at": updated_at}
+                (updated_ids if db.update_item(row.id, changes) else missing_ids).append(row.id)
+        return updated_ids, missing_ids
+
+    def bulk_delete_items(
+        self,
+        db: FakeDatabase,
+        item_ids: Sequence[int],
+        chunk_size: int
+    ) -> Tuple[List[int], List[int]]:
+        deleted_ids, missing_ids = [], []
+        with db.lock:
+            for item_id in item_ids:
+                (deleted_ids if db.delete_item(item_id) is not None else missing_ids).append(item_id)
+        return deleted_ids, missing_ids
+
+    def get_categories(self, db: FakeDatabase) -> List[str]:
+        with db.lock:
+            return db.categories()
+
+    def get_category_stats(self, db: FakeDatabase) -> List[CategoryRecord]:
+        with db.lock:
+            return [db.category_stats(category) for category in db.categories()]
+
+    def get_category_summary(self, db: FakeDatabase, category: str) -> Optional[CategoryRecord]:
+        with db.lock:
+            return db.category_stats(category)
+
+    def get_item_stats(
+        self,
+        db: FakeDatabase,
+        by_category: bool = False,
+        buckets: int = 10,
+        histogram: str = "price"
+    ) -> List[Dict]:
+        """Same shape as ItemCRUD.get_item_stats, read off the price indexes."""
+        with db.lock:
+            scopes = [(None, db.price_index())]
+            if by_category:
+                scopes += [(category, db.price_index(category)) for category in db.categories()]
+            groups = [(category, [db.items_db[item_id] for _, item_id in index]) for category, index in scopes]
+
+        results = []
+        low = width = None
+        for category, records in groups:
+            entry = empty_stats(category)
+            results.append(entry)
+            if not records:
+                continue
+
+            count = len(records)
+            entry.update(count=count, avg_tax=sum(record.tax or 0 for record in records) / count)
+            # Records come in price order; total price needs its own sort
+            for field, values in (
+                ("price", [record.price for record in records]),
+                ("total_price", sorted(record.total_price for record in records)),
+            ):
+                entry[field] = {
+                    "min": values[0],
+                    "max": values[-1],
+                    "avg": sum(values) / count,
+                    "percentiles": {
+                        f"p{percentile}": values[nearest_rank(count, percentile) - 1]
+                        for percentile in STATS_PERCENTILES
+                    },
+                }
+
+            # Histogram over the overall range, so buckets line up across categories
+            if low is None:
+                low, width = entry[histogram]["min"], (entry[histogram]["max"] - entry[histogram]["min"]) / buckets
+            entry["histogram"] = histogram_buckets(low, width, buckets if width else 1)
+            for record in records:
+                index = 0 if width == 0 else min(int((getattr(record, histogram) - low) / width), buckets - 1)
+                entry["histogram"][index]["count"] += 1
+
+        return results
+
+    def search_items(
+        self,
+        db: FakeDatabase,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[float, int]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[ScoredItemRecord]:
+        """Prefix search over name and description; lower scores are better."""
+        terms = _tokens(query)
+        if not terms:
+            return []
+
+        with db.lock:
+            scores = db.match(terms)
+            matches: Iterable[Tuple[float, int]] = ((-weight, item_id) for item_id, weight in scores.items())
+            if after is not None:
+                after = tuple(after)
+                matches = (key for key in matches if key > after)
+                skip = 0
+            page = nsmallest(skip + limit, matches)[skip:]
+            return [ScoredItemRecord(*db.items_db[item_id], score=score) for score, item_id in page]
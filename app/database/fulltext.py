@@ -0,0 +1,123 @@
+import re
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, column, func, literal, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .database import ItemDB, ITEM_COLUMNS
+
+# Full-text index over items.name / items.description.
+#
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# Postgres: a generated tsvector column with a GIN index.
+# Anything else falls back to the old ILIKE scan.
+
+items_fts = table("items_fts", column("rowid"), column("rank"))
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        name, description, content='items', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF name, description ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO items_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+# Adding a generated column backfills every existing row as part of the ALTER
+POSTGRES_DDL = [
+    """
+    ALTER TABLE items ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_items_search_vector ON items USING GIN (search_vector)",
+]
+
+def install_search_index(conn: Connection) -> None:
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'")
+        ).first()
+        for statement in SQLITE_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            # Matches in the name count ten times as much as matches in the description
+            conn.execute(text("INSERT INTO items_fts(items_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')"))
+            rebuild_search_index(conn)
+
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            conn.execute(text(statement))
+
+def rebuild_search_index(conn: Connection) -> None:
+    # Re-reads every row; only needed after writes that bypassed the triggers
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("INSERT INTO items_fts(items_fts) VALUES ('rebuild')"))
+
+def _terms(search: str):
+    return re.findall(r"\w+", search.lower())
+
+def ranked_search(
+    db: Session,
+    search: str,
+    columns: Sequence[ColumnElement] = ITEM_COLUMNS
+) -> Optional[Tuple[Select, ColumnElement]]:
+    """Build a select of `columns` plus a `score` column matching every word in `search`.
+
+    Each word is matched as a prefix. Returns the select together with the score
+    expression; lower scores are better, so callers order and page on
+    (score, id) ascending. Returns None when there is nothing to match.
+    """
+    terms = _terms(search)
+    if not terms:
+        return None
+
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        score = items_fts.c.rank
+        query = select(*columns, score.label("score")).select_from(
+            ItemDB.__table__.join(items_fts, items_fts.c.rowid == ItemDB.id)
+        ).where(literal_column("items_fts").op("MATCH")(match))
+        return query, score
+
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("items.search_vector")
+        score = -func.ts_rank(vector, tsquery)
+        query = select(*columns, score.label("score")).where(vector.op("@@")(tsquery))
+        return query, score
+
+    pattern = f"%{search.lower()}%"
+    score = literal(0.0)
+    query = select(*columns, score.label("score")).where(
+        (ItemDB.name.ilike(pattern)) |
+        (ItemDB.description.ilike(pattern))
+    )
+    return query, score
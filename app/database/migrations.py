@@ -0,0 +1,83 @@
+from typing import Optional
+
+from sqlalchemy import Column, Integer, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
+
+from .database import Base, ItemDB, engine, read_engine
+from .fulltext import install_search_index, rebuild_search_index
+from .category_stats import install_category_stats, rebuild_category_stats
+
+# Schema upgrades layered on top of create_all. create_all only creates missing
+# tables, so anything added to an existing table (indexes, search structures,
+# triggers) is installed here. Every step must be safe to run repeatedly.
+#
+# A completed upgrade records SCHEMA_VERSION in the database, so a replica can
+# start with startup_mode="check" and verify the schema with a single query
+# instead of re-running the DDL. Bump it whenever a step is added or changed.
+
+SCHEMA_VERSION = 1
+
+schema_version = Table("schema_version", Base.metadata, Column("version", Integer, nullable=False))
+
+def ensure_columns(conn: Connection) -> None:
+    existing = {column["name"] for column in inspect(conn).get_columns(ItemDB.__tablename__)}
+    for column in ItemDB.__table__.columns:
+        if column.name not in existing:
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {ItemDB.__tablename__} ADD COLUMN {ddl}"))
+
+def ensure_indexes(conn: Connection) -> None:
+    for index in ItemDB.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+UPGRADE_STEPS = [
+    ensure_columns,
+    ensure_indexes,
+    install_search_index,
+    install_category_stats,
+]
+
+def upgrade(bind: Engine = engine) -> None:
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        for step in UPGRADE_STEPS:
+            step(conn)
+        conn.execute(schema_version.delete())
+        conn.execute(schema_version.insert().values(version=SCHEMA_VERSION))
+
+def current_version(bind: Engine = read_engine) -> Optional[int]:
+    """The schema version recorded by the last upgrade, or None if there is none."""
+    try:
+        with bind.connect() as conn:
+            return conn.execute(select(schema_version.c.version)).scalar()
+    except DBAPIError:
+        # No schema_version table: the database predates versioning or is empty
+        return None
+
+def check_schema(bind: Engine = read_engine) -> None:
+    version = current_version(bind)
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {SCHEMA_VERSION}; "
+            "run `python -m app.database.migrations` or start with startup_mode=migrate"
+        )
+
+def rebuild_search(bind: Engine = engine) -> None:
+    with bind.begin() as conn:
+        rebuild_search_index(conn)
+
+def rebuild_categories(bind: Engine = engine) -> None:
+    with bind.begin() as conn:
+        rebuild_category_stats(conn)
+
+if __name__ == "__main__":
+    # python -m app.database.migrations [--rebuild-search] [--rebuild-categories]
+    import sys
+
+    upgrade()
+    if "--rebuild-search" in sys.argv:
+        rebuild_search()
+    if "--rebuild-categories" in sys.argv:
+        rebuild_categories()
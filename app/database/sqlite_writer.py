@@ -0,0 +1,150 @@
+import contextvars
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+class GroupCommitWriter:
+    """The one thread allowed to write to a production SQLite database.
+
+    Concurrent requests submit their write as a callable taking a Session. The
+    writer drains everything queued (up to `max_batch`), runs each job inside
+    its own SAVEPOINT of a single transaction, and commits once, so N concurrent
+    writes share one fsync instead of queueing on the database lock for N of
+    them. A job that raises only rolls back its own savepoint.
+
+    The Session handed to a job is joined to the writer's transaction with
+    join_transaction_mode="create_savepoint", so the job's own db.commit() only
+    releases a savepoint. Callbacks registered through `after_commit` run once
+    the group transaction is durable.
+    """
+
+    def __init__(self, engine: Engine, max_batch: int = 64):
+        self.engine = engine
+        self.max_batch = max_batch
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        # Run the job in the submitter's context so per-request metrics see its statements
+        job = (future, contextvars.copy_context(), fn, args, kwargs)
+        # Queued under the lock, so a writer that dies can't miss it when failing the queue
+        with self._lock:
+            self._ensure_started()
+            self._jobs.put(job)
+        return future
+
+    def stop(self) -> None:
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._jobs.put(None)
+        # Joined without the lock, which a failing writer takes on its way out
+        thread.join()
+        with self._lock:
+            if self._thread is thread:
+                self._thread = None
+
+    def _ensure_started(self) -> None:
+        # Called with self._lock held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._serve()
+        except Exception as exc:
+            # Typically a failed connect. Fail whatever is queued and let the
+            # next submit start a new writer instead of queueing behind a dead one.
+            logger.exception("SQLite writer stopped")
+            with self._lock:
+                self._thread = None
+                while True:
+                    try:
+                        job = self._jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is not None and not job[0].done():
+                        job[0].set_exception(exc)
+
+    def _serve(self) -> None:
+        with self.engine.connect() as conn:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+
+                batch = [job]
+                stopping = False
+                while len(batch) < self.max_batch:
+                    try:
+                        job = self._jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        stopping = True
+                        break
+                    batch.append(job)
+
+                self._commit_batch(conn, batch)
+                if stopping:
+                    return
+
+    def _commit_batch(self, conn, batch: List[tuple]) -> None:
+        outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+        callbacks: List[Callable[[], None]] = []
+
+        try:
+            with conn.begin():
+                for future, context, fn, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+
+                    job_callbacks: List[Callable[[], None]] = []
+                    savepoint = conn.begin_nested()
+                    session = Session(
+                        bind=conn,
+                        join_transaction_mode="create_savepoint",
+                        expire_on_commit=False,
+                        info={"after_commit": job_callbacks},
+                    )
+                    try:
+                        result = context.run(fn, session, *args, **kwargs)
+                        session.close()
+                        savepoint.commit()
+                    except Exception as exc:
+                        session.close()
+                        savepoint.rollback()
+                        outcomes.append((future, None, exc))
+                    else:
+                        outcomes.append((future, result, None))
+                        callbacks.extend(job_callbacks)
+        except Exception as exc:
+            logger.exception("Group commit of %d writes failed", len(batch))
+            # Including jobs that never ran, e.g. when BEGIN itself failed
+            for future, _, _, _, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.writes += len(outcomes)
+        for callback in callbacks:
+            callback()
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
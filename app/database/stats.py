@@ -0,0 +1,27 @@
+import math
+from typing import Any, Dict, List, Optional
+
+# Shape of the /items/stats entries shared by the SQL and in-memory backends.
+# Percentiles use the nearest-rank method, so every reported value is an actual
+# price and both backends agree exactly.
+
+STATS_PERCENTILES = (25, 50, 75, 90, 95, 99)
+
+def nearest_rank(count: int, percentile: int) -> int:
+    return max(1, math.ceil(percentile / 100 * count))
+
+def empty_stats(category: Optional[str]) -> Dict[str, Any]:
+    return {
+        "category": category,
+        "count": 0,
+        "avg_tax": None,
+        "price": None,
+        "total_price": None,
+        "histogram": [],
+    }
+
+def histogram_buckets(low: float, width: float, buckets: int) -> List[Dict[str, Any]]:
+    return [
+        {"lower": low + index * width, "upper": low + (index + 1) * width, "count": 0}
+        for index in range(buckets)
+    ]
@@ -0,0 +1,22 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the values that identify one version of a representation."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix on either side is ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {
+        candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+    }
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
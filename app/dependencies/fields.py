@@ -0,0 +1,29 @@
+from fastapi import HTTPException, Query, status
+from typing import Callable, Optional, Sequence, Tuple
+
+def sparse_fields(allowed: Sequence[str]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Dependency factory for a `fields` query parameter picking a subset of `allowed`.
+
+    Resolves to None (every field) when the parameter is absent, otherwise to the
+    requested names in `allowed` order, so the response layout doesn't depend on
+    how the client ordered them.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated fields to return, from: {', '.join(allowed)}"
+        )
+    ) -> Optional[Tuple[str, ...]]:
+        if not fields:
+            return None
+
+        requested = {name.strip() for name in fields.split(",")} - {""}
+        unknown = requested - set(allowed)
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields selected"
+            )
+        return tuple(name for name in allowed if name in requested)
+
+    return dependency
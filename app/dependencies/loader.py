@@ -0,0 +1,76 @@
+import asyncio
+from fastapi import Depends
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..database.database import get_db, DBSession
+from ..database.crud import async_item_crud
+
+class ItemLoader:
+    """Request-scoped item lookup that deduplicates and batches.
+
+    Every id is fetched at most once per request. `load` calls made in the same
+    event-loop pass (e.g. under asyncio.gather) are coalesced into a single
+    get_items call, which serves what it can from the item cache and reads the
+    rest with one IN (...) query. Batches run one at a time because they share
+    the request's session.
+    """
+
+    def __init__(self, db: DBSession):
+        self.db = db
+        self._results: Dict[int, Optional[Any]] = {}
+        self._pending: Dict[int, "asyncio.Future[Optional[Any]]"] = {}
+        self._lock = asyncio.Lock()
+        # The event loop only keeps weak references to tasks
+        self._dispatches = set()
+
+    async def load(self, item_id: int) -> Optional[Any]:
+        if item_id in self._results:
+            return self._results[item_id]
+
+        future = self._pending.get(item_id)
+        if future is None:
+            future = self._pending[item_id] = asyncio.get_running_loop().create_future()
+            if len(self._pending) == 1:
+                # First id of a new batch: dispatch once everything queued so far has had a turn
+                asyncio.get_running_loop().call_soon(self._start_dispatch)
+        # Every load of this id awaits the same future; one cancelled caller
+        # mustn't cancel it for the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, item_ids: Iterable[int]) -> List[Optional[Any]]:
+        """Rows in the order of `item_ids`, None for missing ones."""
+        item_ids = list(item_ids)
+        await self._fetch([item_id for item_id in dict.fromkeys(item_ids) if item_id not in self._results])
+        return [self._results[item_id] for item_id in item_ids]
+
+    def _start_dispatch(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        try:
+            await self._fetch(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for item_id, future in batch.items():
+            # A waiter that was cancelled (client gone, timeout) has nothing to receive
+            if not future.done():
+                future.set_result(self._results[item_id])
+
+    async def _fetch(self, item_ids: List[int]) -> None:
+        if not item_ids:
+            return
+        async with self._lock:
+            rows = await async_item_crud.get_items(self.db, item_ids)
+        for item_id in item_ids:
+            self._results[item_id] = rows.get(item_id)
+
+async def get_item_loader(db: DBSession = Depends(get_db)) -> ItemLoader:
+    # FastAPI resolves a dependency once per request, so every handler and
+    # dependency in the request shares this loader
+    return ItemLoader(db)
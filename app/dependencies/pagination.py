@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Cursor keys that don't survive a JSON round trip as-is
+CURSOR_PARSERS = {
+    "created_at": datetime.fromisoformat,
+}
+
+# Sort key values a cursor may carry; anything else (lists, objects) would
+# reach the keyset comparison
+CURSOR_SCALARS = (int, float, str, type(None))
+
+def encode_cursor(**keys: Any) -> str:
+    keys = {
+        field: value.isoformat() if isinstance(value, datetime) else value
+        for field, value in keys.items()
+    }
+    raw = json.dumps(keys, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str], *fields: str) -> Optional[Tuple[Any, ...]]:
+    """Turn an opaque cursor back into the sort key values it was built from.
+
+    The cursor must carry exactly the fields the endpoint pages on, so a cursor
+    issued by one endpoint (or sort order) is rejected by another.
+    """
+    if cursor is None:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        keys = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(keys, dict) or set(keys) != set(fields):
+            raise ValueError(cursor)
+        if any(isinstance(value, bool) or not isinstance(value, CURSOR_SCALARS) for value in keys.values()):
+            raise ValueError(cursor)
+        return tuple(
+            CURSOR_PARSERS[field](keys[field]) if field in CURSOR_PARSERS else keys[field]
+            for field in fields
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, *fields: str) -> None:
+    # A short page means there is nothing after it
+    if len(items) < limit:
+        return
+
+    last = items[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+        **{field: getattr(last, field) for field in fields}
+    )
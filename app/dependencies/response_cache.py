@@ -0,0 +1,61 @@
+from fastapi import Request, Response
+from typing import Callable, Hashable, Optional
+
+from ..core.config import settings
+from ..database.cache import LRUCache, table_generations
+
+# Whole-response cache for read-heavy list and search routes. Entries are keyed
+# by path, normalized query and the generations of the tables the response was
+# computed from; a committed write bumps its table's generation, so later
+# lookups build a different key and the stale entries age out of the LRU. The
+# generations are read before the route queries the database, so a response
+# computed while a write commits is filed under the old generation.
+
+# Tells clients whether the body came from the cache
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Response headers stored with the body and replayed on a hit
+CACHED_HEADERS = ("content-type", "x-next-cursor")
+
+response_cache = (
+    LRUCache(max_size=settings.response_cache_size, ttl=settings.response_cache_ttl)
+    if settings.response_cache_size > 0 else None
+)
+
+class CachedResponse:
+    """A route's handle on its cache entry: serve `response` if set, otherwise
+    build the response and pass it through `store`."""
+
+    def __init__(self, key: Optional[Hashable]):
+        self.key = key
+        self.response: Optional[Response] = None
+
+        if key is not None:
+            entry = response_cache.get(key)
+            if entry is not None:
+                status_code, body, headers = entry
+                self.response = Response(
+                    body, status_code=status_code, headers={**headers, CACHE_STATUS_HEADER: "HIT"}
+                )
+
+    def store(self, response: Response) -> Response:
+        if self.key is not None and response.status_code == 200:
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            response_cache.set(self.key, (response.status_code, bytes(response.body), headers))
+            response.headers[CACHE_STATUS_HEADER] = "MISS"
+        return response
+
+def cache_response(*tables: str) -> Callable[[Request], CachedResponse]:
+    """Dependency factory for routes whose response depends only on the query and `tables`."""
+
+    async def dependency(request: Request) -> CachedResponse:
+        if response_cache is None:
+            return CachedResponse(None)
+
+        # Parameter order and empty values don't change the response
+        query = tuple(sorted(
+            (name, value) for name, value in request.query_params.multi_items() if value != ""
+        ))
+        return CachedResponse((request.url.path, query, table_generations.current(*tables)))
+
+    return dependency
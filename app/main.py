@@ -1,12 +1,22 @@
+from .core.startup import StartupReport, FirstRequestMiddleware, use_precomputed_openapi
+
+# Started before the remaining imports so the report covers them
+startup_report = StartupReport()
+
 from fastapi import FastAPI
+from fastapi.responses import Response
 from datetime import datetime
+import os
 
 from .routers import items, categories, search
-from .database.database import create_tables
+from .database.migrations import upgrade, check_schema
+from .database.crud import item_crud
+from .database.database import IS_MEMORY, writer
+from .database.fake_db import fake_items_db
+from .database.cache import table_generations
+from .dependencies.response_cache import response_cache
 from .core.config import settings
-
-# Create database tables on startup
-create_tables()
+from .core.metrics import MetricsMiddleware, METRICS_CONTENT_TYPE, render_metrics
 
 app = FastAPI(
     title=settings.app_name,
@@ -14,11 +24,44 @@ app = FastAPI(
     version=settings.app_version
 )
 
+app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+app.add_middleware(FirstRequestMiddleware, report=startup_report)
+
 # Include routers
 app.include_router(items.router)
 app.include_router(categories.router)
 app.include_router(search.router)
 
+startup_report.mark("import")
+
+@app.on_event("startup")
+def prepare_database():
+    # The in-memory store starts from its last snapshot; SQL databases get the
+    # schema upgrade, a version check or nothing, per startup_mode
+    if IS_MEMORY:
+        if settings.memory_snapshot_path and os.path.exists(settings.memory_snapshot_path):
+            fake_items_db.load(settings.memory_snapshot_path)
+    elif settings.startup_mode == "migrate":
+        upgrade()
+    elif settings.startup_mode == "check":
+        check_schema()
+    startup_report.mark("database")
+
+    use_precomputed_openapi(app, settings.openapi_path)
+    startup_report.mark("openapi")
+    startup_report.finish()
+
+@app.on_event("shutdown")
+def stop_writer():
+    # Let queued writes commit before the process exits
+    if writer is not None:
+        writer.stop()
+
+@app.on_event("shutdown")
+def save_snapshot():
+    if IS_MEMORY and settings.memory_snapshot_path:
+        fake_items_db.save(settings.memory_snapshot_path)
+
 @app.get('/', response_model=dict)
 def read_root():
     return {
@@ -39,4 +82,20 @@ def health_check():
         "timestamp": datetime.now(),
         "database": "SQLite Connected",
         "version": settings.app_version
-    }
\ No newline at end of file
+    }
+
+@app.get("/cache/stats", response_model=dict)
+def cache_stats():
+    return {
+        "items": item_crud.cache.stats() if item_crud.cache else None,
+        "responses": response_cache.stats() if response_cache else None,
+        "generations": table_generations.stats()
+    }
+
+@app.get("/startup", include_in_schema=False)
+def startup_stats():
+    return startup_report.as_dict()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 class Item(BaseModel):
@@ -37,6 +37,61 @@ class ItemUpdate(BaseModel):
     tax: Optional[float] = Field(None, ge=0)
     category: Optional[str] = None
 
+class ItemBulkUpdate(ItemUpdate):
+    id: int = Field(..., gt=0, description="ID of the item to update")
+
+class BulkItemError(BaseModel):
+    index: int = Field(..., description="Position of the row in the request")
+    item_id: Optional[int] = None
+    detail: Any
+
+class BulkResponse(BaseModel):
+    processed: int
+    item_ids: List[int]
+    errors: List[BulkItemError]
+
+# Most ids one batch lookup may ask for
+MAX_BATCH_IDS = 100
+
+class ItemBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS, description="Item ids, in the order wanted back")
+
+class ItemBatchResponse(BaseModel):
+    items: List[ItemResponse] = Field(..., description="Found items in request order, each id once")
+    missing_ids: List[int]
+
+class CategorySummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    category: str
+    item_count: int
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    avg_price: Optional[float] = None
+
+class FieldStats(BaseModel):
+    min: float
+    max: float
+    avg: float
+    percentiles: Dict[str, float] = Field(..., description="Nearest-rank percentiles, keyed p50, p90, ...")
+
+class HistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+class ItemStats(BaseModel):
+    category: Optional[str] = None
+    count: int
+    avg_tax: Optional[float] = None
+    price: Optional[FieldStats] = None
+    total_price: Optional[FieldStats] = None
+    histogram: List[HistogramBucket]
+
+class ItemStatsResponse(BaseModel):
+    overall: ItemStats
+    categories: Optional[List[ItemStats]] = Field(None, description="Per-category stats when grouped by category")
+
 class MessageResponse(BaseModel):
     message: str
     item_id: Optional[int] = None
\ No newline at end of file
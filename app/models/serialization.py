@@ -0,0 +1,31 @@
+from fastapi.responses import Response
+from pydantic_core import to_json
+from typing import Any, Dict, Iterable, Sequence
+
+from .item import ItemResponse
+
+# Field order of the JSON body, shared with the row projection in database.ITEM_COLUMNS
+ITEM_FIELDS = tuple(ItemResponse.model_fields)
+
+class ItemJSONResponse(Response):
+    """Response whose body is already-serialized JSON bytes.
+
+    Returning it from a route bypasses response_model validation, so routes keep
+    response_model only for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+def item_payload(item: Any, fields: Sequence[str] = ITEM_FIELDS) -> Dict[str, Any]:
+    # Works on Core rows and ItemDB objects alike
+    return {field: getattr(item, field) for field in fields}
+
+def dump_items(items: Iterable[Any], fields: Sequence[str] = ITEM_FIELDS) -> bytes:
+    """Serialize rows we read from our own database straight to JSON, with no
+    per-row model construction or validation. `fields` picks a sparse fieldset."""
+    return to_json([item_payload(item, fields) for item in items])
+
+def dump_item(item: Any, **overrides: Any) -> bytes:
+    return to_json({**item_payload(item), **overrides})
+
+def dump_item_batch(items: Iterable[Any], missing_ids: Sequence[int]) -> bytes:
+    return to_json({"items": [item_payload(item) for item in items], "missing_ids": list(missing_ids)})
@@ -0,0 +1,8 @@
+from .core.startup import write_openapi
+from .main import app
+
+if __name__ == "__main__":
+    # python -m app.openapi PATH: precompute the schema served with openapi_path=PATH
+    import sys
+
+    write_openapi(app, sys.argv[1])
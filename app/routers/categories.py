@@ -1,46 +1,72 @@
 from fastapi import APIRouter, HTTPException, status, Query, Path, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from ..models.item import ItemResponse
-from ..database.database import get_db
-from ..database.crud import item_crud
+from ..models.item import ItemResponse, CategorySummary
+from ..models.serialization import ItemJSONResponse, dump_items
+from ..database.database import get_db, DBSession
+from ..database.crud import async_item_crud
+from ..dependencies.pagination import decode_cursor, set_next_cursor
+from ..dependencies.response_cache import CachedResponse, cache_response
 
 router = APIRouter()
 
 @router.get("/categories/{category}/items", response_model=List[ItemResponse])
-def get_items_by_category(
+async def get_items_by_category(
     category: str = Path(..., description="Category name"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    db: DBSession = Depends(get_db),
+    cached: CachedResponse = Depends(cache_response("items"))
 ):
-    items = item_crud.get_all_items(db=db, skip=skip, limit=limit, category=category)
+    if cached.response is not None:
+        return cached.response
 
-    if not items:
+    after = decode_cursor(cursor, "price", "id")
+    
+    # The category summary answers "is this category empty?" without touching items
+    if await async_item_crud.get_category_summary(db=db, category=category) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No items found in category '{category}'"
         )
     
-    # Convert to response format
-    response_items = []
-    for item in items:
-        total_price = item.price + (item.tax or 0)
-        response_items.append(ItemResponse(
-            id=item.id,
-            name=item.name,
-            description=item.description,
-            price=item.price,
-            tax=item.tax,
-            total_price=total_price,
-            category=item.category,
-            created_at=item.created_at,
-            updated_at=item.updated_at
-        ))
+    # Sorted by price so pages walk the (category, price, id) index
+    items = await async_item_crud.get_all_items(
+        db=db,
+        skip=skip,
+        limit=limit,
+        category=category,
+        sort="price",
+        after=after
+    )
+
+    # Running off the end of a cursor walk is not an error
+    if not items and after is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No items found in category '{category}'"
+        )
     
-    return response_items
+    response = ItemJSONResponse(dump_items(items))
+    set_next_cursor(response, items, limit, "price", "id")
+    return cached.store(response)
 
-@router.get("/categories", response_model=List[str])
-def get_categories(db: Session = Depends(get_db)):
-    return item_crud.get_categories(db=db)
+@router.get("/categories", response_model=Union[List[str], List[CategorySummary]])
+async def get_categories(
+    include_stats: bool = Query(False, description="Return item count and price summary per category"),
+    db: DBSession = Depends(get_db)
+):
+    if not include_stats:
+        return await async_item_crud.get_categories(db=db)
+    
+    return [
+        CategorySummary(
+            category=stats.category,
+            item_count=stats.item_count,
+            min_price=stats.min_price,
+            max_price=stats.max_price,
+            avg_price=stats.price_sum / stats.item_count
+        )
+        for stats in await async_item_crud.get_category_stats(db=db)
+    ]
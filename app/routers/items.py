@@ -1,131 +1,314 @@
-from fastapi import APIRouter, HTTPException, status, Query, Path, Depends
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Query, Path, Depends, Body, Header
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from datetime import datetime
+import csv
+import io
+import json
 
-from ..models.item import Item, ItemResponse, ItemUpdate, MessageResponse
-from ..database.database import get_db
-from ..database.crud import item_crud
+from ..models.item import (
+    Item, ItemResponse, ItemUpdate, ItemBulkUpdate, MessageResponse,
+    BulkItemError, BulkResponse, ItemStatsResponse, ItemBatchRequest, ItemBatchResponse, MAX_BATCH_IDS
+)
+from ..models.serialization import ItemJSONResponse, ITEM_FIELDS, dump_item, dump_items, dump_item_batch
+from ..core.config import settings
+from ..database.database import get_db, DBSession
+from ..database.crud import async_item_crud, ITEM_COLUMNS, sort_key
+from ..dependencies.pagination import decode_cursor, set_next_cursor
+from ..dependencies.etag import make_etag, etag_matches, not_modified
+from ..dependencies.response_cache import CachedResponse, cache_response
+from ..dependencies.fields import sparse_fields
+from ..dependencies.loader import ItemLoader, get_item_loader
 
 router = APIRouter()
 
 @router.get("/items/", response_model=List[ItemResponse])
-def read_items(
+async def read_items(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of items to be returned"),
     category: Optional[str] = Query(None, description="Filter by category"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum Price filter"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum Price filter"),
-    db: Session = Depends(get_db)
+    min_total_price: Optional[float] = Query(None, ge=0, description="Minimum total price (price + tax) filter"),
+    max_total_price: Optional[float] = Query(None, ge=0, description="Maximum total price (price + tax) filter"),
+    sort: Optional[str] = Query(
+        None,
+        pattern="^-?(price|total_price|created_at|name)$",
+        description="Sort field, prefix with '-' for descending; defaults to id"
+    ),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ITEM_FIELDS)),
+    db: DBSession = Depends(get_db),
+    cached: CachedResponse = Depends(cache_response("items"))
 ):
-    items = item_crud.get_all_items(
+    if cached.response is not None:
+        return cached.response
+
+    keys = sort_key(sort)
+    items = await async_item_crud.get_all_items(
         db=db, 
         skip=skip, 
         limit=limit, 
         category=category, 
         min_price=min_price, 
-        max_price=max_price
+        max_price=max_price,
+        min_total_price=min_total_price,
+        max_total_price=max_total_price,
+        sort=sort,
+        after=decode_cursor(cursor, *keys),
+        fields=fields
     )
     
-    # Convert to response format with total_price
-    response_items = []
-    for item in items:
-        total_price = item.price + (item.tax or 0)
-        response_items.append(ItemResponse(
-            id=item.id,
-            name=item.name,
-            description=item.description,
-            price=item.price,
-            tax=item.tax,
-            total_price=total_price,
-            category=item.category,
-            created_at=item.created_at,
-            updated_at=item.updated_at
-        ))
+    response = ItemJSONResponse(dump_items(items, fields or ITEM_FIELDS))
+    set_next_cursor(response, items, limit, *keys)
+    return cached.store(response)
+
+EXPORT_FIELDS = [column.key for column in ITEM_COLUMNS]
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _ndjson_rows(rows: Sequence[Any]) -> str:
+    return "".join(
+        json.dumps(row._asdict(), default=_json_default) + "\n" for row in rows
+    )
+
+def _csv_rows(rows: Sequence[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+# format -> (media type, header, batch encoder)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "", _ndjson_rows),
+    "csv": ("text/csv", _csv_rows([EXPORT_FIELDS]), _csv_rows),
+}
+
+@router.get("/items/export", response_class=StreamingResponse)
+async def export_items(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum Price filter"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum Price filter")
+):
+    media_type, header, encode = EXPORT_FORMATS[export_format]
+    filters = dict(
+        category=category,
+        min_price=min_price,
+        max_price=max_price,
+        batch_size=settings.export_batch_size
+    )
     
-    return response_items
+    async def stream():
+        yield header
+        async for rows in async_item_crud.stream_items(**filters):
+            yield encode(rows)
 
-@router.get("/items/{item_id}", response_model=ItemResponse)
-def read_item(
-    item_id: int = Path(..., gt=0, description="ID of the item to retrieve"),
-    include_tax: bool = Query(False, description="Include tax in response"),
-    db: Session = Depends(get_db)
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="items.{export_format}"'}
+    )
+
+# Registered before /items/{item_id} so "stats" is not taken as an id
+@router.get("/items/stats", response_model=ItemStatsResponse)
+async def item_stats(
+    group_by: Optional[str] = Query(None, pattern="^category$", description="Also report stats per category"),
+    buckets: int = Query(10, ge=1, le=100, description="Number of histogram buckets"),
+    histogram: str = Query("price", pattern="^(price|total_price)$", description="Field the histogram is built on"),
+    db: DBSession = Depends(get_db),
+    cached: CachedResponse = Depends(cache_response("items"))
 ):
-    db_item = item_crud.get_item_by_id(db, item_id)
-    if not db_item:
+    if cached.response is not None:
+        return cached.response
+
+    scopes = await async_item_crud.get_item_stats(
+        db=db,
+        by_category=group_by == "category",
+        buckets=buckets,
+        histogram=histogram
+    )
+    stats = ItemStatsResponse(
+        overall=scopes[0],
+        categories=scopes[1:] if group_by else None
+    )
+    return cached.store(ItemJSONResponse(stats.model_dump_json().encode()))
+
+async def _batch_response(item_ids: Sequence[int], loader: ItemLoader) -> ItemJSONResponse:
+    # Each id once, in the order first asked for
+    item_ids = list(dict.fromkeys(item_ids))
+    rows = await loader.load_many(item_ids)
+    return ItemJSONResponse(dump_item_batch(
+        [row for row in rows if row is not None],
+        [item_id for item_id, row in zip(item_ids, rows) if row is None]
+    ))
+
+# Registered before /items/{item_id} so "batch" is not taken as an id
+@router.get("/items/batch", response_model=ItemBatchResponse)
+async def read_items_batch(
+    ids: List[str] = Query(..., description="Item ids, comma-separated or repeated"),
+    loader: ItemLoader = Depends(get_item_loader)
+):
+    try:
+        item_ids = [int(value) for param in ids for value in param.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be integers")
+    if not item_ids or len(item_ids) > MAX_BATCH_IDS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Item with id {item_id} not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {MAX_BATCH_IDS} ids are allowed"
         )
+    return await _batch_response(item_ids, loader)
 
-    total_price = db_item.price + (db_item.tax or 0)
+@router.post("/items/batch", response_model=ItemBatchResponse)
+async def read_items_batch_post(
+    batch: ItemBatchRequest,
+    loader: ItemLoader = Depends(get_item_loader)
+):
+    # Same lookup as GET, for id lists too long for a URL
+    return await _batch_response(batch.ids, loader)
+
+def validate_rows(
+    model: Type[BaseModel],
+    rows: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, Any]], List[BulkItemError]]:
+    # Validate each row on its own so one bad row doesn't reject the whole batch
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, model.model_validate(row)))
+        except ValidationError as exc:
+            item_id = row.get("id")
+            errors.append(BulkItemError(
+                index=index,
+                # The bad value itself may be the id; it's in `detail` either way
+                item_id=item_id if isinstance(item_id, int) and not isinstance(item_id, bool) else None,
+                detail=exc.errors(include_url=False, include_context=False)
+            ))
+    return valid, errors
+
+# Bulk routes are registered before /items/{item_id} so "bulk" is not taken as an id
+@router.post("/items/bulk", response_model=BulkResponse)
+async def bulk_create_items(
+    items: List[Dict[str, Any]] = Body(..., description="Items to create"),
+    db: DBSession = Depends(get_db)
+):
+    valid, errors = validate_rows(Item, items)
+    item_ids = await async_item_crud.bulk_create_items(
+        db=db,
+        items=[item for _, item in valid],
+        chunk_size=settings.bulk_chunk_size
+    )
     
-    response_item = ItemResponse(
-        id=db_item.id,
-        name=db_item.name,
-        description=db_item.description,
-        price=db_item.price,
-        tax=db_item.tax if include_tax else None,
-        total_price=total_price if include_tax else db_item.price,
-        category=db_item.category,
-        created_at=db_item.created_at,
-        updated_at=db_item.updated_at
+    return BulkResponse(processed=len(item_ids), item_ids=item_ids, errors=errors)
+
+@router.patch("/items/bulk", response_model=BulkResponse)
+async def bulk_update_items(
+    updates: List[Dict[str, Any]] = Body(..., description="Partial updates, each with the item id"),
+    db: DBSession = Depends(get_db)
+):
+    valid, errors = validate_rows(ItemBulkUpdate, updates)
+    updated_ids, missing_ids = await async_item_crud.bulk_update_items(
+        db=db,
+        updates=[update for _, update in valid],
+        chunk_size=settings.bulk_chunk_size
     )
     
-    return response_item
+    missing = set(missing_ids)
+    for index, update in valid:
+        if update.id in missing:
+            errors.append(BulkItemError(
+                index=index,
+                item_id=update.id,
+                detail=f"Item with id {update.id} not found"
+            ))
+    errors.sort(key=lambda error: error.index)
+    
+    return BulkResponse(processed=len(updated_ids), item_ids=updated_ids, errors=errors)
 
-@router.post("/items/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
-def create_item(
-    item: Item,
-    db: Session = Depends(get_db)
+@router.delete("/items/bulk", response_model=BulkResponse)
+async def bulk_delete_items(
+    item_ids: List[int] = Body(..., description="IDs of the items to delete"),
+    db: DBSession = Depends(get_db)
 ):
-    db_item = item_crud.create_item(db=db, item=item)
-    total_price = db_item.price + (db_item.tax or 0)
+    deleted_ids, missing_ids = await async_item_crud.bulk_delete_items(
+        db=db,
+        item_ids=list(dict.fromkeys(item_ids)),
+        chunk_size=settings.bulk_chunk_size
+    )
     
-    return ItemResponse(
-        id=db_item.id,
-        name=db_item.name,
-        description=db_item.description,
-        price=db_item.price,
-        tax=db_item.tax,
-        total_price=total_price,
-        category=db_item.category,
-        created_at=db_item.created_at,
-        updated_at=db_item.updated_at
+    missing = set(missing_ids)
+    errors = [
+        BulkItemError(index=index, item_id=item_id, detail=f"Item with id {item_id} not found")
+        for index, item_id in enumerate(item_ids)
+        if item_id in missing
+    ]
+    
+    return BulkResponse(processed=len(deleted_ids), item_ids=deleted_ids, errors=errors)
+
+@router.get("/items/{item_id}", response_model=ItemResponse)
+async def read_item(
+    item_id: int = Path(..., gt=0, description="ID of the item to retrieve"),
+    include_tax: bool = Query(False, description="Include tax in response"),
+    if_none_match: Optional[str] = Header(None, description="ETag from an earlier response"),
+    db: DBSession = Depends(get_db)
+):
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Item with id {item_id} not found"
     )
 
+    # Revalidation only needs the item's version, not the item
+    if if_none_match:
+        version = await async_item_crud.get_item_version(db, item_id)
+        if version is None:
+            raise not_found
+        etag = make_etag("item", item_id, version.isoformat(), include_tax)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    db_item = await async_item_crud.get_item(db, item_id)
+    if not db_item:
+        raise not_found
+
+    # The ETag covers the include_tax variant as well as the item version
+    etag = make_etag("item", item_id, (db_item.updated_at or db_item.created_at).isoformat(), include_tax)
+    if include_tax:
+        return ItemJSONResponse(dump_item(db_item), headers={"ETag": etag})
+    return ItemJSONResponse(dump_item(db_item, tax=None, total_price=db_item.price), headers={"ETag": etag})
+
+@router.post("/items/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
+async def create_item(
+    item: Item,
+    db: DBSession = Depends(get_db)
+):
+    db_item = await async_item_crud.create_item(db=db, item=item)
+    return ItemJSONResponse(dump_item(db_item), status_code=status.HTTP_201_CREATED)
+
 @router.put("/items/{item_id}", response_model=ItemResponse)
-def update_item(
+async def update_item(
     item_update: ItemUpdate,
     item_id: int = Path(..., gt=0, description="ID of the item to update"),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
-    db_item = item_crud.update_item(db=db, item_id=item_id, item_update=item_update)
+    db_item = await async_item_crud.update_item(db=db, item_id=item_id, item_update=item_update)
     if not db_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item with id {item_id} not found"
         )
     
-    total_price = db_item.price + (db_item.tax or 0)
-    
-    return ItemResponse(
-        id=db_item.id,
-        name=db_item.name,
-        description=db_item.description,
-        price=db_item.price,
-        tax=db_item.tax,
-        total_price=total_price,
-        category=db_item.category,
-        created_at=db_item.created_at,
-        updated_at=db_item.updated_at
-    )
+    return ItemJSONResponse(dump_item(db_item))
 
 @router.delete("/items/{item_id}", response_model=MessageResponse)
-def delete_item(
+async def delete_item(
     item_id: int = Path(..., gt=0, description="ID of the item to delete"),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
-    db_item = item_crud.delete_item(db=db, item_id=item_id)
+    db_item = await async_item_crud.delete_item(db=db, item_id=item_id)
     if not db_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
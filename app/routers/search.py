@@ -1,42 +1,42 @@
 from fastapi import APIRouter, HTTPException, status, Query, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 
 from ..models.item import ItemResponse
-from ..database.database import get_db
-from ..database.crud import item_crud
+from ..models.serialization import ItemJSONResponse, ITEM_FIELDS, dump_items
+from ..database.database import get_db, DBSession
+from ..database.crud import async_item_crud
+from ..dependencies.pagination import decode_cursor, set_next_cursor
+from ..dependencies.response_cache import CachedResponse, cache_response
+from ..dependencies.fields import sparse_fields
 
 router = APIRouter()
 
 @router.get("/search/", response_model=List[ItemResponse])
-def search_items(
+async def search_items(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ITEM_FIELDS)),
+    db: DBSession = Depends(get_db),
+    cached: CachedResponse = Depends(cache_response("items"))
 ):
-    items = item_crud.search_items(db=db, query=q, skip=skip, limit=limit)
+    if cached.response is not None:
+        return cached.response
+
+    after = decode_cursor(cursor, "score", "id")
+    results = await async_item_crud.search_items(
+        db=db, query=q, skip=skip, limit=limit, after=after, fields=fields
+    )
     
-    if not items:
+    # Running off the end of a cursor walk is not an error
+    if not results and after is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No items found matching '{q}'"
         )
     
-    # Convert to response format
-    response_items = []
-    for item in items:
-        total_price = item.price + (item.tax or 0)
-        response_items.append(ItemResponse(
-            id=item.id,
-            name=item.name,
-            description=item.description,
-            price=item.price,
-            tax=item.tax,
-            total_price=total_price,
-            category=item.category,
-            created_at=item.created_at,
-            updated_at=item.updated_at
-        ))
-    
-    return response_items
+    # Results are ranked, so the cursor carries the relevance score as well as the id
+    response = ItemJSONResponse(dump_items(results, fields or ITEM_FIELDS))
+    set_next_cursor(response, results, limit, "score", "id")
+    return cached.store(response)
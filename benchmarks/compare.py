@@ -0,0 +1,53 @@
+"""Compare two benchmarks.run result files endpoint by endpoint.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Exits with status 1 if any endpoint's p95 latency grew, or its throughput
+dropped, by more than --threshold percent.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+def change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change counted as a regression")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    print(f"baseline {baseline.get('revision')}  vs  candidate {candidate.get('revision')}")
+
+    regressions = 0
+    for app, new_result in candidate["apps"].items():
+        old_result = baseline["apps"].get(app)
+        if old_result is None:
+            continue
+
+        print(f"\n{app}")
+        print(f"  {'endpoint':<28}{'rps':>10}{'Δ rps':>9}{'p95 ms':>10}{'Δ p95':>9}")
+        rows = list(new_result["endpoints"].items()) + [("total", new_result["total"])]
+        for label, new in rows:
+            old = old_result["total"] if label == "total" else old_result["endpoints"].get(label)
+            if old is None:
+                continue
+            rps_change = change(old["rps"], new["rps"])
+            p95_change = change(old["p95_ms"], new["p95_ms"])
+            regressed = rps_change < -args.threshold or p95_change > args.threshold
+            regressions += regressed
+            print(
+                f"  {label:<28}{new['rps']:>10.1f}{rps_change:>+8.1f}%{new['p95_ms']:>10.2f}{p95_change:>+8.1f}%"
+                + ("  REGRESSION" if regressed else "")
+            )
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import http.client
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
+
+# Load generator using only the standard library: one keep-alive HTTP/1.1
+# connection per worker thread, a weighted mix of operations, and per-endpoint
+# latency samples merged at the end.
+
+class Client:
+    """Keep-alive HTTP connection to one server. Not thread safe; one per worker."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        json_body: Any = None,
+        form: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, bytes, Dict[str, str]]:
+        headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urlencode(form).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        # One retry covers a keep-alive connection the server closed while idle
+        for attempt in (0, 1):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                response = self._conn.getresponse()
+                data = response.read()
+                return response.status, data, {k.lower(): v for k, v in response.getheaders()}
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    def json(self, method: str, path: str, **kwargs: Any) -> Any:
+        status, data, _ = self.request(method, path, **kwargs)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} -> {status}: {data[:200]!r}")
+        return json.loads(data) if data else None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+class Worker:
+    """What an operation gets: a client, a seeded RNG, shared state and a timer."""
+
+    def __init__(self, client: Client, rng: random.Random, state: Dict[str, Any]):
+        self.client = client
+        self.rng = rng
+        self.state = state
+        self.samples: Dict[str, Samples] = {}
+        self.recording = False
+
+    def call(self, label: str, method: str, path: str, **kwargs: Any) -> Tuple[int, bytes, Dict[str, str]]:
+        """Issue one request and record its latency under `label`."""
+        start = time.perf_counter()
+        try:
+            status, data, headers = self.client.request(method, path, **kwargs)
+        except Exception:
+            status, data, headers = 0, b"", {}
+        elapsed = time.perf_counter() - start
+
+        if self.recording:
+            samples = self.samples.setdefault(label, Samples())
+            samples.latencies.append(elapsed)
+            samples.statuses[status] = samples.statuses.get(status, 0) + 1
+            if not 200 <= status < 400:
+                samples.errors += 1
+        return status, data, headers
+
+Operation = Callable[[Worker], None]
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples: Samples, elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(samples.latencies)
+    count = len(latencies)
+    to_ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": count,
+        "errors": samples.errors,
+        "statuses": {str(code): n for code, n in sorted(samples.statuses.items())},
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": to_ms(sum(latencies) / count) if count else 0.0,
+        "p50_ms": to_ms(percentile(latencies, 50)),
+        "p95_ms": to_ms(percentile(latencies, 95)),
+        "p99_ms": to_ms(percentile(latencies, 99)),
+        "max_ms": to_ms(latencies[-1]) if count else 0.0,
+    }
+
+def run_load(
+    base_url: str,
+    mix: Sequence[Tuple[float, Operation]],
+    state: Dict[str, Any],
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Run the weighted mix from `concurrency` threads for warmup + duration seconds.
+
+    Only requests issued after the warmup are recorded. Returns per-endpoint
+    summaries plus a "total" entry across all endpoints.
+    """
+    weights = [weight for weight, _ in mix]
+    operations = [operation for _, operation in mix]
+    workers = [
+        Worker(Client(base_url), random.Random(seed * 1000 + index), state)
+        for index in range(concurrency)
+    ]
+
+    start = time.perf_counter()
+    record_from = start + warmup
+    stop_at = record_from + duration
+
+    def loop(worker: Worker) -> None:
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                worker.recording = now >= record_from
+                worker.rng.choices(operations, weights)[0](worker)
+        finally:
+            worker.client.close()
+
+    threads = [threading.Thread(target=loop, args=(worker,), daemon=True) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = max(time.perf_counter(), stop_at) - record_from
+
+    merged: Dict[str, Samples] = {}
+    for worker in workers:
+        for label, samples in worker.samples.items():
+            target = merged.setdefault(label, Samples())
+            target.latencies.extend(samples.latencies)
+            target.errors += samples.errors
+            for status, n in samples.statuses.items():
+                target.statuses[status] = target.statuses.get(status, 0) + n
+
+    total = Samples()
+    for samples in merged.values():
+        total.latencies.extend(samples.latencies)
+        total.errors += samples.errors
+        for status, n in samples.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + n
+
+    endpoints = {label: summarize(samples, elapsed) for label, samples in sorted(merged.items())}
+    return {"elapsed_s": round(elapsed, 3), "endpoints": endpoints, "total": summarize(total, elapsed)}
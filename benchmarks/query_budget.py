@@ -0,0 +1,77 @@
+"""Check the SQL statement count of the blog's list endpoints against a budget.
+
+    python -m benchmarks.query_budget
+    python -m benchmarks.query_budget --page-sizes 1 25 100 --database-url postgresql+asyncpg://user@localhost/blog_bench
+
+Starts the blog with Server-Timing enabled, seeds it, then requests every list
+endpoint once per page size and reads the statement count from the response.
+A list that loads a relationship per row (PostSummary.author) needs more
+statements the larger the page; the budget is the same for every page size, so
+that shows up here as a failure. Exits with status 1 if any request goes over.
+"""
+import argparse
+import random
+import re
+import sys
+from typing import List, Optional, Tuple
+
+from .loadgen import Client
+from .servers import serve
+from .workloads import seed_blog
+
+# (label, path with a {limit} placeholder, statements allowed, authenticated).
+# Authenticated endpoints get one more for resolving the bearer token to a user.
+BLOG_BUDGETS: List[Tuple[str, str, int, bool]] = [
+    ("GET /posts/", "/posts/?limit={limit}", 1, False),
+    ("GET /posts/?fields=", "/posts/?limit={limit}&fields=id,title,author", 1, False),
+    ("GET /posts/search", "/posts/search?q=a&limit={limit}", 1, False),
+    ("GET /posts/my-posts", "/posts/my-posts?limit={limit}", 2, True),
+    ("GET /users/", "/users/?limit={limit}", 2, True),
+]
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+def statement_count(client: Client, path: str, token: Optional[str]) -> int:
+    headers = {"Authorization": f"Bearer {token}"} if token else None
+    status, data, headers = client.request("GET", path, headers=headers)
+    if status != 200:
+        raise RuntimeError(f"GET {path} -> {status}: {data[:200]!r}")
+    match = SERVER_TIMING_QUERIES.search(headers.get("server-timing", ""))
+    if match is None:
+        raise RuntimeError(f"GET {path}: no query count in the Server-Timing header")
+    return int(match.group(1))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check SQL statements per list request against a budget")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[1, 10, 100], metavar="N",
+                        help="limit values to request each endpoint with")
+    parser.add_argument("--scale", type=int, default=2, help="seed data multiplier (100 posts each)")
+    parser.add_argument("--database-url", help="run against this database instead of a fresh SQLite file")
+    args = parser.parse_args(argv)
+
+    over = 0
+    with serve("blog", database_url=args.database_url, env={"SERVER_TIMING": "1"}) as base_url:
+        client = Client(base_url)
+        state = seed_blog(client, args.scale, random.Random(1))
+        token = state["tokens"][0]
+
+        print(f"  {'endpoint':<24}{'budget':>8}" + "".join(f"{f'n={size}':>8}" for size in args.page_sizes))
+        for label, path, budget, authenticated in BLOG_BUDGETS:
+            # Each URL is requested once, so no response comes from the response cache
+            counts = [
+                statement_count(client, path.format(limit=size), token if authenticated else None)
+                for size in args.page_sizes
+            ]
+            failed = [count for count in counts if count > budget]
+            over += len(failed)
+            print(
+                f"  {label:<24}{budget:>8}" + "".join(f"{count:>8}" for count in counts)
+                + ("  OVER BUDGET" if failed else "")
+            )
+        client.close()
+
+    print("\nAll list endpoints within budget" if not over else f"\n{over} request(s) over budget")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
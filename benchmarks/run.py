@@ -0,0 +1,114 @@
+"""HTTP load benchmark for the items, blog and quiz services.
+
+    python -m benchmarks.run                       # all three apps, default settings
+    python -m benchmarks.run items --duration 30 --concurrency 16 --scale 4
+    python -m benchmarks.run blog --database-url postgresql+asyncpg://user@localhost/blog_bench
+    python -m benchmarks.run blog-auth            # blog, authenticated requests only
+
+Each app is started under uvicorn against a fresh SQLite database (or the
+given --database-url), seeded, then driven with its mixed workload. Results go
+to stdout as a table and to a JSON file for benchmarks.compare.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .loadgen import Client, run_load
+from .servers import APPS, REPO_ROOT, serve
+from .workloads import WORKLOADS
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_app(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    workload = WORKLOADS[name]
+    with serve(name, database_url=args.database_url, workers=args.workers) as base_url:
+        seed_started = time.perf_counter()
+        client = Client(base_url)
+        state = workload.seed(client, args.scale, random.Random(args.seed))
+        client.close()
+        seed_seconds = time.perf_counter() - seed_started
+
+        result = run_load(
+            base_url,
+            workload.mix,
+            state,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            seed=args.seed,
+        )
+    result["seed_s"] = round(seed_seconds, 3)
+    return result
+
+def print_table(name: str, result: Dict[str, Any]) -> None:
+    print(f"\n{name}  ({result['elapsed_s']}s measured, seeded in {result['seed_s']}s)")
+    print(f"  {'endpoint':<28}{'reqs':>8}{'err':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(result["endpoints"].items()) + [("total", result["total"])]
+    for label, stats in rows:
+        print(
+            f"  {label:<28}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP load benchmark for the FastAPI services")
+    parser.add_argument("apps", nargs="*", metavar="APP",
+                        help=f"apps to benchmark: {', '.join(APPS)} (default: all)")
+    parser.add_argument("--scale", type=int, default=1, help="seed data multiplier")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per app")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unrecorded seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent client connections")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed for data and request mix")
+    parser.add_argument("--database-url", help="run against this database instead of a fresh SQLite file")
+    parser.add_argument("--output", type=Path, default=REPO_ROOT / "benchmarks" / "results",
+                        help="directory for the JSON results file")
+    args = parser.parse_args(argv)
+    apps = args.apps or list(APPS)
+    unknown = [name for name in apps if name not in APPS]
+    if unknown:
+        parser.error(f"unknown app: {', '.join(unknown)}")
+
+    if args.database_url and len(apps) != 1:
+        parser.error("--database-url needs exactly one app")
+
+    revision = git_revision()
+    report: Dict[str, Any] = {
+        "revision": revision,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: value for key, value in vars(args).items() if key not in ("apps", "output")
+        },
+        "apps": {},
+    }
+
+    for name in apps:
+        result = bench_app(name, args)
+        report["apps"][name] = result
+        print_table(name, result)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = args.output / f"{'-'.join(apps)}-{revision or 'norev'}-{stamp}.json"
+    path.write_text(json.dumps(report, indent=2, default=str) + "\n")
+    print(f"\nResults written to {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
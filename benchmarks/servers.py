@@ -0,0 +1,118 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+@dataclass(frozen=True)
+class AppSpec:
+    cwd: Path
+    target: str
+    # Path polled until the server answers
+    ready_path: str
+    # Local SQLite database to run against, given a scratch directory
+    default_database_url: Callable[[Path], str]
+
+APPS: Dict[str, AppSpec] = {
+    "items": AppSpec(
+        cwd=REPO_ROOT,
+        target="app.main:app",
+        ready_path="/health",
+        default_database_url=lambda scratch: f"sqlite:///{scratch}/items.db",
+    ),
+    "blog": AppSpec(
+        cwd=REPO_ROOT / "blog_app",
+        target="main:app",
+        ready_path="/health",
+        default_database_url=lambda scratch: f"sqlite+aiosqlite:///{scratch}/blog.db",
+    ),
+    # Same server as "blog", driven with the authenticated-only workload
+    "blog-auth": AppSpec(
+        cwd=REPO_ROOT / "blog_app",
+        target="main:app",
+        ready_path="/health",
+        default_database_url=lambda scratch: f"sqlite+aiosqlite:///{scratch}/blog.db",
+    ),
+    "quiz": AppSpec(
+        cwd=REPO_ROOT / "fastapi-postgresql",
+        target="main:app",
+        ready_path="/openapi.json",
+        default_database_url=lambda scratch: f"sqlite:///{scratch}/quiz.db",
+    ),
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.1)
+    raise RuntimeError(f"server not ready after {timeout:.0f}s: {url}")
+
+@contextmanager
+def serve(
+    name: str,
+    database_url: Optional[str] = None,
+    workers: int = 1,
+    env: Optional[Dict[str, str]] = None,
+    startup_timeout: float = 60.0,
+) -> Iterator[str]:
+    """Run one app under uvicorn on a free local port and yield its base URL.
+
+    Without a database_url the app gets a fresh SQLite database in a scratch
+    directory, so every run starts from the same empty state.
+    """
+    spec = APPS[name]
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as scratch:
+        port = free_port()
+        process_env = {
+            **os.environ,
+            "DATABASE_URL": database_url or spec.default_database_url(Path(scratch)),
+            **(env or {}),
+        }
+        log_path = Path(scratch) / "server.log"
+        with open(log_path, "wb") as log:
+            process = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", spec.target,
+                    "--host", "127.0.0.1", "--port", str(port),
+                    "--workers", str(workers),
+                    "--log-level", "warning", "--no-access-log",
+                ],
+                cwd=spec.cwd,
+                env=process_env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+            base_url = f"http://127.0.0.1:{port}"
+            try:
+                wait_until_ready(base_url + spec.ready_path, process, startup_timeout)
+                yield base_url
+            except Exception:
+                sys.stderr.write(log_path.read_text(errors="replace")[-4000:])
+                raise
+            finally:
+                process.terminate()
+                try:
+                    process.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
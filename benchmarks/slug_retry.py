@@ -0,0 +1,84 @@
+"""Check that the blog picks the next free slug when it loses a slug race.
+
+    python -m benchmarks.slug_retry
+    python -m benchmarks.slug_retry --database-url postgresql+asyncpg://user@localhost/blog_check
+
+Runs the blog's CRUD functions in-process against a fresh SQLite database (or
+the given --database-url, whose tables are created if missing). Slug lookups
+are made to miss the taken slug once, as when a concurrent writer takes it
+between our read and our flush. create_post and update_post must then retry in
+a new savepoint and pick the next free slug. Exits with status 1 otherwise.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from .servers import APPS
+
+async def check() -> List[str]:
+    from app.database import crud
+    from app.database.database import AsyncSessionLocal, Base, async_engine
+    from app.models.models import User
+    from app.schemas.schemas import PostCreate, PostUpdate
+
+    taken_slugs = crud._taken_slugs
+    misses: List[str] = []
+
+    async def stale_taken_slugs(db, base, post_id=None):
+        taken = await taken_slugs(db, base, post_id)
+        if base not in misses:
+            misses.append(base)
+            return [slug for slug in taken if slug != base]
+        return taken
+
+    failures = []
+    try:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSessionLocal() as db:
+            author = User(username="slug-check", email="slug-check@example.com", hashed_password="-")
+            db.add(author)
+            await db.commit()
+            first = await crud.create_post(db, PostCreate(title="Slug retry", content="-"), author.id)
+            other = await crud.create_post(db, PostCreate(title="Slug retry other", content="-"), author.id)
+
+            crud._taken_slugs = stale_taken_slugs
+            try:
+                created = await crud.create_post(db, PostCreate(title="Slug retry", content="-"), author.id)
+                misses.clear()
+                updated = await crud.update_post(db, other.id, PostUpdate(title="Slug retry"))
+            finally:
+                crud._taken_slugs = taken_slugs
+
+            slugs = {first.slug, created.slug, updated.slug}
+            if first.slug != "slug-retry" or len(slugs) != 3:
+                failures.append(f"slugs not distinct: {first.slug}, {created.slug}, {updated.slug}")
+            for label, post in (("create", created), ("update", updated)):
+                print(f"  {label:<8}{post.slug}")
+    finally:
+        await async_engine.dispose()
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check slug conflict retries in the blog")
+    parser.add_argument("--database-url", help="run against this database instead of a fresh SQLite file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="slug-retry-") as scratch:
+        spec = APPS["blog"]
+        # Settings are read when the blog modules are imported
+        os.environ["DATABASE_URL"] = args.database_url or spec.default_database_url(Path(scratch))
+        sys.path.insert(0, str(spec.cwd))
+        failures = asyncio.run(check())
+
+    for failure in failures:
+        print(failure)
+    print("\nSlug retries pick the next free slug" if not failures else "\nSlug retry check failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import itertools
+import json
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .loadgen import Client, Operation, Worker
+
+# Seed data and request mixes for each app. `scale` multiplies the seeded row
+# counts; mix weights are relative frequencies.
+
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima "
+    "mike november oscar papa quebec romeo sierra tango uniform victor whiskey"
+).split()
+CATEGORIES = ["books", "games", "garden", "kitchen", "music", "sports", "tools", "toys"]
+PASSWORD = "bench-password-123"
+
+# Unique suffixes for rows created during a run, shared across worker threads
+_serial = itertools.count()
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+@dataclass(frozen=True)
+class Workload:
+    seed: Callable[[Client, int, random.Random], Dict[str, Any]]
+    mix: Sequence[Tuple[float, Operation]]
+
+# Items service
+
+def _item(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "name": _phrase(rng, 2),
+        "description": _phrase(rng, 8),
+        "price": round(rng.uniform(1, 500), 2),
+        "tax": rng.choice([None, 0.0, round(rng.uniform(0, 50), 2)]),
+        "category": rng.choice(CATEGORIES),
+    }
+
+def seed_items(client: Client, scale: int, rng: random.Random) -> Dict[str, Any]:
+    item_ids: List[int] = []
+    for _ in range(scale * 2):
+        result = client.json("POST", "/items/bulk", json_body=[_item(rng) for _ in range(500)])
+        item_ids.extend(result["item_ids"])
+    return {"item_ids": item_ids}
+
+def items_list(worker: Worker) -> None:
+    rng = worker.rng
+    params = [f"limit={rng.choice([10, 20, 50])}"]
+    if rng.random() < 0.5:
+        params.append(f"category={rng.choice(CATEGORIES)}")
+    if rng.random() < 0.5:
+        params.append(f"sort={rng.choice(['price', '-price', 'total_price', '-created_at', 'name'])}")
+    if rng.random() < 0.3:
+        low = rng.randint(1, 300)
+        params.append(f"min_price={low}&max_price={low + 100}")
+    status, _, headers = worker.call("GET /items/", "GET", "/items/?" + "&".join(params))
+
+    # Follow the cursor to a second page, as a client scrolling would
+    cursor = headers.get("x-next-cursor")
+    if status == 200 and cursor:
+        worker.call("GET /items/ (cursor)", "GET", "/items/?" + "&".join(params + [f"cursor={cursor}"]))
+
+def items_get(worker: Worker) -> None:
+    item_id = worker.rng.choice(worker.state["item_ids"])
+    worker.call("GET /items/{id}", "GET", f"/items/{item_id}")
+
+def items_search(worker: Worker) -> None:
+    worker.call("GET /search/", "GET", f"/search/?q={worker.rng.choice(WORDS)}&limit=20")
+
+def items_create(worker: Worker) -> None:
+    status, data, _ = worker.call("POST /items/", "POST", "/items/", json_body=_item(worker.rng))
+    if status == 201:
+        worker.state["item_ids"].append(json.loads(data)["id"])
+
+ITEMS = Workload(
+    seed=seed_items,
+    mix=[(40, items_list), (25, items_get), (20, items_search), (15, items_create)],
+)
+
+# Blog
+
+def _login(client: Client, username: str) -> str:
+    token = client.json("POST", "/auth/login", form={"username": username, "password": PASSWORD})
+    return token["access_token"]
+
+def _register(client: Client, username: str) -> Tuple[int, bytes, Dict[str, str]]:
+    return client.request("POST", "/auth/register", json_body={
+        "username": username,
+        "email": f"{username}@example.com",
+        "full_name": username.title(),
+        "password": PASSWORD,
+    })
+
+def seed_blog(client: Client, scale: int, rng: random.Random) -> Dict[str, Any]:
+    usernames, tokens, post_ids = [], [], []
+    for index in range(10 * scale):
+        username = f"author{index}"
+        status, data, _ = _register(client, username)
+        if status != 201:
+            raise RuntimeError(f"register {username} -> {status}: {data[:200]!r}")
+        usernames.append(username)
+        tokens.append(_login(client, username))
+
+    for _ in range(100 * scale):
+        post = client.json(
+            "POST", "/posts/",
+            json_body={"title": _phrase(rng, 4), "content": _phrase(rng, 60), "is_published": rng.random() < 0.9},
+            headers={"Authorization": f"Bearer {rng.choice(tokens)}"},
+        )
+        post_ids.append(post["id"])
+    return {"usernames": usernames, "tokens": tokens, "post_ids": post_ids}
+
+def blog_feed(worker: Worker) -> None:
+    worker.call("GET /posts/", "GET", f"/posts/?limit=20&skip={worker.rng.randint(0, 40)}")
+
+def blog_search(worker: Worker) -> None:
+    worker.call("GET /posts/search", "GET", f"/posts/search?q={worker.rng.choice(WORDS)}&limit=20")
+
+def blog_read(worker: Worker) -> None:
+    worker.call("GET /posts/{id}", "GET", f"/posts/{worker.rng.choice(worker.state['post_ids'])}")
+
+def blog_create(worker: Worker) -> None:
+    rng = worker.rng
+    status, data, _ = worker.call(
+        "POST /posts/", "POST", "/posts/",
+        json_body={"title": _phrase(rng, 4), "content": _phrase(rng, 60), "is_published": True},
+        headers={"Authorization": f"Bearer {rng.choice(worker.state['tokens'])}"},
+    )
+    if status == 201:
+        worker.state["post_ids"].append(json.loads(data)["id"])
+
+def blog_login(worker: Worker) -> None:
+    worker.call(
+        "POST /auth/login", "POST", "/auth/login",
+        form={"username": worker.rng.choice(worker.state["usernames"]), "password": PASSWORD},
+    )
+
+def blog_register(worker: Worker) -> None:
+    username = f"user{next(_serial)}x{worker.rng.getrandbits(32):08x}"
+    worker.call("POST /auth/register", "POST", "/auth/register", json_body={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": PASSWORD,
+    })
+
+BLOG = Workload(
+    seed=seed_blog,
+    mix=[
+        (35, blog_feed),
+        (20, blog_read),
+        (20, blog_search),
+        (10, blog_create),
+        (10, blog_login),
+        (5, blog_register),
+    ],
+)
+
+# Blog, authenticated traffic only: every request resolves the bearer token to a
+# user before doing its own work
+
+def seed_blog_auth(client: Client, scale: int, rng: random.Random) -> Dict[str, Any]:
+    tokens, own_posts = [], []
+    for index in range(10 * scale):
+        username = f"writer{index}"
+        status, data, _ = _register(client, username)
+        if status != 201:
+            raise RuntimeError(f"register {username} -> {status}: {data[:200]!r}")
+        token = _login(client, username)
+        tokens.append(token)
+        own_posts.append([
+            client.json(
+                "POST", "/posts/",
+                json_body={"title": _phrase(rng, 4), "content": _phrase(rng, 60), "is_published": True},
+                headers={"Authorization": f"Bearer {token}"},
+            )["id"]
+            for _ in range(10)
+        ])
+    return {"tokens": tokens, "own_posts": own_posts}
+
+def _author(worker: Worker) -> Tuple[int, Dict[str, str]]:
+    index = worker.rng.randrange(len(worker.state["tokens"]))
+    return index, {"Authorization": f"Bearer {worker.state['tokens'][index]}"}
+
+def blog_auth_me(worker: Worker) -> None:
+    worker.call("GET /auth/me", "GET", "/auth/me", headers=_author(worker)[1])
+
+def blog_auth_my_posts(worker: Worker) -> None:
+    worker.call("GET /posts/my-posts", "GET", "/posts/my-posts?limit=20", headers=_author(worker)[1])
+
+def blog_auth_create(worker: Worker) -> None:
+    rng = worker.rng
+    index, headers = _author(worker)
+    status, data, _ = worker.call(
+        "POST /posts/", "POST", "/posts/",
+        json_body={"title": _phrase(rng, 4), "content": _phrase(rng, 60), "is_published": True},
+        headers=headers,
+    )
+    if status == 201:
+        worker.state["own_posts"][index].append(json.loads(data)["id"])
+
+def blog_auth_update(worker: Worker) -> None:
+    rng = worker.rng
+    index, headers = _author(worker)
+    post_id = rng.choice(worker.state["own_posts"][index])
+    worker.call(
+        "PUT /posts/{id}", "PUT", f"/posts/{post_id}",
+        json_body={"content": _phrase(rng, 60)}, headers=headers,
+    )
+
+BLOG_AUTH = Workload(
+    seed=seed_blog_auth,
+    mix=[
+        (30, blog_auth_me),
+        (30, blog_auth_my_posts),
+        (20, blog_auth_create),
+        (20, blog_auth_update),
+    ],
+)
+
+# Quiz
+
+def _question(rng: random.Random) -> Dict[str, Any]:
+    correct = rng.randrange(4)
+    return {
+        "question_text": _phrase(rng, 6) + "?",
+        "choices": [{"choice_text": _phrase(rng, 2), "is_correct": index == correct} for index in range(4)],
+    }
+
+def seed_quiz(client: Client, scale: int, rng: random.Random) -> Dict[str, Any]:
+    # POST /questions returns no body; ids are assigned sequentially on a fresh database
+    count = 200 * scale
+    for _ in range(count):
+        client.request("POST", "/questions", json_body=_question(rng))
+    return {"question_count": count}
+
+def quiz_create(worker: Worker) -> None:
+    worker.call("POST /questions", "POST", "/questions", json_body=_question(worker.rng))
+
+def quiz_question(worker: Worker) -> None:
+    question_id = worker.rng.randint(1, worker.state["question_count"])
+    worker.call("GET /questions/{id}", "GET", f"/questions/{question_id}")
+
+def quiz_choices(worker: Worker) -> None:
+    question_id = worker.rng.randint(1, worker.state["question_count"])
+    worker.call("GET /choices/{id}", "GET", f"/choices/{question_id}")
+
+QUIZ = Workload(
+    seed=seed_quiz,
+    mix=[(40, quiz_question), (30, quiz_choices), (30, quiz_create)],
+)
+
+WORKLOADS: Dict[str, Workload] = {
+    "items": ITEMS,
+    "blog": BLOG,
+    "blog-auth": BLOG_AUTH,
+    "quiz": QUIZ,
+}
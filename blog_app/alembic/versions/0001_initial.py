@@ -0,0 +1,68 @@
+"""Initial schema: users and posts
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created by the old create_all startup already have these tables;
+    # they are adopted as-is and stamped
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("username", sa.String(length=50), nullable=False),
+            sa.Column("email", sa.String(length=100), nullable=False),
+            sa.Column("hashed_password", sa.String(length=255), nullable=False),
+            sa.Column("full_name", sa.String(length=100), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_users_id"), "users", ["id"], unique=False)
+        op.create_index(op.f("ix_users_username"), "users", ["username"], unique=True)
+        op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+
+    if "posts" not in existing:
+        op.create_table(
+            "posts",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(length=200), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("slug", sa.String(length=250), nullable=False),
+            sa.Column("is_published", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("author_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["author_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_posts_id"), "posts", ["id"], unique=False)
+        op.create_index(op.f("ix_posts_title"), "posts", ["title"], unique=False)
+        op.create_index(op.f("ix_posts_slug"), "posts", ["slug"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_posts_slug"), table_name="posts")
+    op.drop_index(op.f("ix_posts_title"), table_name="posts")
+    op.drop_index(op.f("ix_posts_id"), table_name="posts")
+    op.drop_table("posts")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_index(op.f("ix_users_username"), table_name="users")
+    op.drop_index(op.f("ix_users_id"), table_name="users")
+    op.drop_table("users")
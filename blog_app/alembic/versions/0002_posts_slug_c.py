@@ -0,0 +1,27 @@
+"""Byte-ordered slug index for the slug prefix range scan (PostgreSQL)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite's ix_posts_slug already compares bytes
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index("ix_posts_slug_c", "posts", [sa.text('slug COLLATE "C"')], unique=False)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_posts_slug_c", table_name="posts")
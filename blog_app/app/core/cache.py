@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+# Response cache for the public post listings. Entries are keyed by path,
+# normalized query and the generation of every table the response reads; CRUD
+# write functions bump their table's generation after committing, so stale
+# entries are never looked up again and simply age out of the LRU.
+
+class TableGenerations:
+    """Per-table change counters."""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        """Record a committed change to each table."""
+        with self._lock:
+            for table in tables:
+                self._counters[table] = self._counters.get(table, 0) + 1
+
+    def current(self, *tables: str) -> Tuple[int, ...]:
+        """Get the current generation of each table."""
+        with self._lock:
+            return tuple(self._counters.get(table, 0) for table in tables)
+
+class TTLCache:
+    """Thread-safe LRU whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a fresh entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry for `ttl` seconds (default: the cache's TTL), evicting
+        the least recently used past max_size."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+table_generations = TableGenerations()
+
+response_cache = (
+    TTLCache(max_size=settings.response_cache_size, ttl=settings.response_cache_ttl)
+    if settings.response_cache_size > 0 else None
+)
+
+class CachedResponse:
+    """A route's cache entry: serve `response` if set, else build one and `store` it."""
+
+    def __init__(self, key: Optional[Hashable]):
+        self.key = key
+        self.response: Optional[Response] = None
+
+        if key is not None:
+            body = response_cache.get(key)
+            if body is not None:
+                self.response = Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+    def store(self, body: bytes) -> Response:
+        """Cache a serialized JSON body and return it as the response."""
+        response = Response(body, media_type="application/json")
+        if self.key is not None:
+            response_cache.set(self.key, body)
+            response.headers["X-Cache"] = "MISS"
+        return response
+
+def cache_response(*tables: str) -> Callable[[Request], CachedResponse]:
+    """Dependency for routes whose response depends only on the query and `tables`."""
+
+    async def dependency(request: Request) -> CachedResponse:
+        if response_cache is None:
+            return CachedResponse(None)
+        query = tuple(sorted(
+            (name, value) for name, value in request.query_params.multi_items() if value != ""
+        ))
+        return CachedResponse((request.url.path, query, table_generations.current(*tables)))
+
+    return dependency
@@ -6,6 +6,26 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-here-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    server_timing: bool = False
+    response_cache_size: int = 1024
+    response_cache_ttl: float = 30.0
+    # Authenticated users by username, and decoded access tokens; 0 disables
+    principal_cache_size: int = 1024
+    principal_cache_ttl: float = 60.0
+    token_cache_size: int = 4096
+    # Argon2id cost (memory in KiB); hashes made with other values are
+    # upgraded on the user's next login
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+    # Processes that hash and verify passwords, and how long a request waits
+    # for one before getting a 503
+    password_workers: int = 2
+    password_queue_timeout: float = 5.0
+    # "migrate" runs Alembic on startup, "check" only compares the database
+    # revision with the head, "skip" leaves the first request to connect
+    startup_mode: str = "migrate"
+    openapi_path: Optional[str] = None
     
     class Config:
         env_file = ".env"
@@ -1,14 +1,15 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
 from app.database.crud import get_user_by_username
 from app.utils.auth import verify_token
-from app.models.models import User
+from app.core.principals import Principal, cached_principal, cache_principal, principal_generation
+from typing import Callable, Optional, Sequence, Tuple
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
     """Get current authenticated user."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -20,14 +21,39 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     if username is None:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=username)
+    principal = cached_principal(username)
+    if principal is not None:
+        return principal
+
+    generation = principal_generation()
+    user = await get_user_by_username(db, username=username)
     if user is None:
         raise credentials_exception
     
-    return user
+    return cache_principal(user, generation)
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+def sparse_fields(allowed: Sequence[str]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Dependency factory for a `fields` query parameter picking a subset of `allowed`."""
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Comma-separated fields to return, from: {', '.join(allowed)}")
+    ) -> Optional[Tuple[str, ...]]:
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",")} - {""}
+        unknown = requested - set(allowed)
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields selected"
+            )
+        # Response layout follows `allowed`, not the order they were asked in
+        return tuple(name for name in allowed if name in requested)
+
+    return dependency
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.models import User
+
+# Authenticated users by token subject (username), so protected requests don't
+# query the users table. Entries are snapshots without the password hash.
+# Committing an ORM update or delete of a User drops that user's entry; the TTL
+# bounds how long other worker processes, and bulk UPDATEs that bypass the ORM,
+# can serve a stale one.
+
+@dataclass(frozen=True)
+class Principal:
+    """Read-only snapshot of an authenticated user."""
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Snapshot a loaded User."""
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            created_at=user.created_at,
+        )
+
+principal_cache = (
+    TTLCache(max_size=settings.principal_cache_size, ttl=settings.principal_cache_ttl)
+    if settings.principal_cache_size > 0 else None
+)
+
+# Bumped on every invalidation. A principal read from the database is only
+# cached if no invalidation happened meanwhile, so a lookup racing a commit
+# can't put back the entry the commit just dropped.
+_generation = 0
+
+def principal_generation() -> int:
+    """Get the invalidation generation, to pass to cache_principal."""
+    return _generation
+
+def cached_principal(username: str) -> Optional[Principal]:
+    """Get the cached principal for a username, or None."""
+    if principal_cache is None:
+        return None
+    return principal_cache.get(username)
+
+def cache_principal(user: User, generation: int) -> Principal:
+    """Snapshot `user`, caching it unless invalidated since `generation`."""
+    principal = Principal.from_user(user)
+    if principal_cache is not None and generation == _generation:
+        principal_cache.set(user.username, principal)
+    return principal
+
+def forget_principals(*usernames: str) -> None:
+    """Drop the cached principals of `usernames`."""
+    global _generation
+    _generation += 1
+    if principal_cache is not None:
+        for username in usernames:
+            principal_cache.discard(username)
+
+# Usernames whose rows a session changed, dropped from the cache once the
+# change is committed and visible to the lookups that would reload them
+_CHANGED_USERNAMES = "changed_usernames"
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    usernames = state.session.info.setdefault(_CHANGED_USERNAMES, set())
+    usernames.add(target.username)
+    # A rename also retires the old subject
+    usernames.update(state.attrs.username.history.deleted)
+
+@event.listens_for(Session, "after_commit")
+def _forget_changed_users(session: Session) -> None:
+    usernames = session.info.pop(_CHANGED_USERNAMES, None)
+    if usernames:
+        forget_principals(*usernames)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERNAMES, None)
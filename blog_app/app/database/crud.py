@@ -1,27 +1,37 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy import and_, or_, select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
 from app.models.models import User, Post
 from app.schemas.schemas import UserCreate, PostCreate, PostUpdate
-from app.utils.auth import get_password_hash
-from app.utils.helpers import generate_unique_slug
-from typing import Optional, List
+from app.utils.auth import hash_password
+from app.utils.helpers import create_slug, generate_unique_slug
+from app.core.cache import table_generations
+from app.database.database import async_engine
+from typing import Optional, List, Sequence
+from datetime import datetime, timezone
+
+# Every function takes an AsyncSession. Relationships can't be lazy-loaded
+# outside the session's greenlet, so queries whose results are serialized with
+# their author join it in the same statement.
 
 # User CRUD operations
-def get_user(db: Session, user_id: int) -> Optional[User]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
     """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+    return await db.scalar(select(User).where(User.id == user_id))
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    return await db.scalar(select(User).where(User.email == email))
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     """Get user by username."""
-    return db.query(User).filter(User.username == username).first()
+    return await db.scalar(select(User).where(User.username == username))
 
-def create_user(db: Session, user: UserCreate) -> User:
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Create new user."""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -29,90 +39,186 @@ def create_user(db: Session, user: UserCreate) -> User:
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    table_generations.bump("users")
+    await db.refresh(db_user)
     return db_user
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
+async def update_password_hash(db: AsyncSession, user: User, hashed_password: str) -> User:
+    """Replace a user's password hash."""
+    user.hashed_password = hashed_password
+    await db.commit()
+    table_generations.bump("users")
+    return user
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
     """Get list of users."""
-    return db.query(User).offset(skip).limit(limit).all()
+    return list(await db.scalars(select(User).offset(skip).limit(limit)))
 
 # Post CRUD operations
-def get_post(db: Session, post_id: int) -> Optional[Post]:
+def _posts_with_author():
+    """Select posts joined to their authors.
+
+    Every post has exactly one author, so the join adds no rows: a page of
+    posts is one statement whatever its size, and LIMIT/OFFSET still count posts.
+    """
+    return select(Post).options(joinedload(Post.author, innerjoin=True))
+
+async def get_post(db: AsyncSession, post_id: int) -> Optional[Post]:
     """Get post by ID."""
-    return db.query(Post).filter(Post.id == post_id).first()
+    return await db.scalar(_posts_with_author().where(Post.id == post_id))
 
-def get_post_by_slug(db: Session, slug: str) -> Optional[Post]:
+async def get_post_by_slug(db: AsyncSession, slug: str) -> Optional[Post]:
     """Get post by slug."""
-    return db.query(Post).filter(Post.slug == slug).first()
+    return await db.scalar(_posts_with_author().where(Post.slug == slug))
+
+def _post_version_query():
+    # Only the id and timestamp columns of the post and its author; no Text columns
+    return select(
+        Post.id,
+        func.coalesce(Post.updated_at, Post.created_at).label("post_version"),
+        Post.author_id,
+        func.coalesce(User.updated_at, User.created_at).label("author_version"),
+    ).join(User, Post.author_id == User.id)
+
+async def get_post_version(db: AsyncSession, post_id: int) -> Optional[Row]:
+    """Get the version of a post and its author by post ID."""
+    return (await db.execute(_post_version_query().where(Post.id == post_id))).first()
 
-def get_posts(db: Session, skip: int = 0, limit: int = 100, published_only: bool = False) -> List[Post]:
-    """Get list of posts."""
-    query = db.query(Post)
+async def get_post_version_by_slug(db: AsyncSession, slug: str) -> Optional[Row]:
+    """Get the version of a post and its author by slug."""
+    return (await db.execute(_post_version_query().where(Post.slug == slug))).first()
+
+async def get_posts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    published_only: bool = False,
+    columns: Optional[Sequence] = None,
+    with_author: bool = True
+) -> List[Post]:
+    """Get list of posts, loading only `columns` if given."""
+    query = _posts_with_author() if with_author else select(Post)
+    if columns:
+        query = query.options(load_only(*columns))
     if published_only:
-        query = query.filter(Post.is_published == True)
-    return query.offset(skip).limit(limit).all()
+        query = query.where(Post.is_published == True)
+    return list(await db.scalars(query.offset(skip).limit(limit)))
 
-def get_posts_by_author(db: Session, author_id: int, skip: int = 0, limit: int = 100) -> List[Post]:
+async def get_posts_by_author(db: AsyncSession, author_id: int, skip: int = 0, limit: int = 100) -> List[Post]:
     """Get posts by author."""
-    return db.query(Post).filter(Post.author_id == author_id).offset(skip).limit(limit).all()
+    return list(await db.scalars(
+        _posts_with_author().where(Post.author_id == author_id).offset(skip).limit(limit)
+    ))
 
-def create_post(db: Session, post: PostCreate, author_id: int) -> Post:
-    """Create new post."""
-    # Get existing slugs to ensure uniqueness
-    existing_posts = db.query(Post).all()
-    existing_slugs = [p.slug for p in existing_posts]
-    
-    slug = generate_unique_slug(post.title, existing_slugs)
-    
-    db_post = Post(
-        title=post.title,
-        content=post.content,
-        slug=slug,
-        is_published=post.is_published,
-        author_id=author_id
+# Attempts at a unique slug before giving up; each failure means a concurrent
+# writer took the slug between our read and our insert
+SLUG_ATTEMPTS = 5
+
+# Slugs compared byte by byte. PostgreSQL's usual collations (en_US.UTF-8)
+# ignore punctuation at first, so '.' need not sort right after '-'; SQLite
+# already compares bytes and has no "C" collation.
+_slug_bytes = Post.slug.collate("C") if async_engine.dialect.name == "postgresql" else Post.slug
+
+async def _taken_slugs(db: AsyncSession, base: str, post_id: Optional[int] = None) -> List[str]:
+    """Slugs of other posts that are `base` or start with `base-`.
+
+    A range scan ('.' sorts right after '-' byte-wise) on a byte-ordered slug
+    index: ix_posts_slug on SQLite, ix_posts_slug_c on PostgreSQL. The cost
+    depends on the number of similar slugs, not the number of posts.
+    """
+    query = select(Post.slug).where(or_(
+        Post.slug == base,
+        and_(_slug_bytes >= f"{base}-", _slug_bytes < f"{base}.")
+    ))
+    if post_id is not None:
+        query = query.where(Post.id != post_id)
+    return list(await db.scalars(query))
+
+async def _flush_with_unique_slug(db: AsyncSession, post: Post, title: str, changes: dict) -> None:
+    """Apply `changes` to `post` and flush it under the first free slug for `title`.
+
+    The unique index on Post.slug is the arbiter: each attempt runs in a
+    savepoint, and losing a race to a concurrent writer rolls back only that
+    savepoint before the next free slug is tried.
+    """
+    base = create_slug(title)
+    # Read once: a rolled-back savepoint expires a persistent post's attributes,
+    # and reloading them here would be lazy IO outside the session's greenlet
+    post_id = post.id
+    for attempt in range(SLUG_ATTEMPTS):
+        slug = generate_unique_slug(title, set(await _taken_slugs(db, base, post_id)))
+        try:
+            async with db.begin_nested():
+                for field, value in changes.items():
+                    setattr(post, field, value)
+                post.slug = slug
+                db.add(post)
+                await db.flush()
+            return
+        except IntegrityError:
+            if attempt == SLUG_ATTEMPTS - 1:
+                raise
+
+async def _reload_post(db: AsyncSession, post_id: int) -> Optional[Post]:
+    """Re-read a post and its author after a commit, as stored."""
+    return await db.scalar(
+        _posts_with_author().where(Post.id == post_id).execution_options(populate_existing=True)
     )
-    db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
-    return db_post
 
-def update_post(db: Session, post_id: int, post_update: PostUpdate) -> Optional[Post]:
+async def create_post(db: AsyncSession, post: PostCreate, author_id: int) -> Post:
+    """Create new post."""
+    db_post = Post(author_id=author_id)
+    await _flush_with_unique_slug(db, db_post, post.title, {
+        "title": post.title,
+        "content": post.content,
+        "is_published": post.is_published,
+    })
+    await db.commit()
+    table_generations.bump("posts")
+    return await _reload_post(db, db_post.id)
+
+async def update_post(db: AsyncSession, post_id: int, post_update: PostUpdate) -> Optional[Post]:
     """Update post."""
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    # Usually already in the session from the caller's ownership check
+    db_post = await db.get(Post, post_id)
     if not db_post:
         return None
-    
+
     update_data = post_update.dict(exclude_unset=True)
-    
+    # Set here rather than by onupdate=func.now(), which is only second-precise
+    # on SQLite; post ETags are derived from it
+    update_data["updated_at"] = datetime.now(timezone.utc)
+
     # If title is being updated, update slug too
     if "title" in update_data:
-        existing_posts = db.query(Post).filter(Post.id != post_id).all()
-        existing_slugs = [p.slug for p in existing_posts]
-        update_data["slug"] = generate_unique_slug(update_data["title"], existing_slugs)
-    
-    for field, value in update_data.items():
-        setattr(db_post, field, value)
-    
-    db.commit()
-    db.refresh(db_post)
-    return db_post
-
-def delete_post(db: Session, post_id: int) -> bool:
+        await _flush_with_unique_slug(db, db_post, update_data["title"], update_data)
+    else:
+        for field, value in update_data.items():
+            setattr(db_post, field, value)
+
+    await db.commit()
+    table_generations.bump("posts")
+    return await _reload_post(db, post_id)
+
+async def delete_post(db: AsyncSession, post_id: int) -> bool:
     """Delete post."""
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = await db.get(Post, post_id)
     if not db_post:
         return False
-    
-    db.delete(db_post)
-    db.commit()
+
+    await db.delete(db_post)
+    await db.commit()
+    table_generations.bump("posts")
     return True
 
-def search_posts(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Post]:
+async def search_posts(db: AsyncSession, query: str, skip: int = 0, limit: int = 100) -> List[Post]:
     """Search posts by title or content."""
-    return db.query(Post).filter(
-        or_(
-            Post.title.ilike(f"%{query}%"),
-            Post.content.ilike(f"%{query}%")
-        )
-    ).offset(skip).limit(limit).all()
+    return list(await db.scalars(
+        _posts_with_author().where(
+            or_(
+                Post.title.ilike(f"%{query}%"),
+                Post.content.ilike(f"%{query}%")
+            )
+        ).offset(skip).limit(limit)
+    ))
@@ -1,26 +1,29 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 # Create async engine for asyncpg
 async_engine = create_async_engine(settings.database_url)
 
-# Create sync engine for migrations
-sync_engine = create_engine(settings.database_url.replace("+asyncpg", ""))
+# The same database without the async driver, for the `alembic` command line
+# (alembic/env.py); migrations run on startup use async_engine
+sync_database_url = settings.database_url.replace("+asyncpg", "").replace("+aiosqlite", "")
 
-# Create AsyncSession class
+# Count statements and database time per request
+instrument_engine(async_engine.sync_engine)
+
+# Create AsyncSession class; objects are serialized after the session's work is
+# done, so don't expire them on commit
 AsyncSessionLocal = sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
 )
 
-# Create sync SessionLocal for migrations
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
-
 # Create Base class
 Base = declarative_base()
 
@@ -31,11 +34,3 @@ async def get_async_db():
             yield session
         finally:
             await session.close()
-
-# Dependency to get sync DB session (for migrations)
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
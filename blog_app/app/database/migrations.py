@@ -0,0 +1,41 @@
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Connection
+
+# blog_app/, where alembic.ini and the alembic/ scripts live
+BLOG_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic config that works from any working directory."""
+    config = Config(os.path.join(BLOG_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BLOG_DIR, "alembic"))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+def head_revision() -> str:
+    """Latest revision in the migration scripts."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Revision the database was last migrated to, or None."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+def upgrade_database(connection: Connection) -> None:
+    """Run all pending migrations on `connection`."""
+    command.upgrade(alembic_config(connection), "head")
+
+def check_schema(connection: Connection) -> None:
+    """Raise unless the database is at the migrations head."""
+    current, head = current_revision(connection), head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database is at revision {current}, expected {head}; "
+            "run `alembic upgrade head` or start with STARTUP_MODE=migrate"
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, collate
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.database import Base
@@ -34,3 +34,8 @@ class Post(Base):
     
     # Relationship
     author = relationship("User", back_populates="posts")
+
+    # Byte-ordered slug index for the slug prefix range scan (see crud._taken_slugs)
+    __table_args__ = (
+        Index("ix_posts_slug_c", collate(slug, "C")).ddl_if(dialect="postgresql"),
+    )
@@ -1,109 +1,204 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.database.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from pydantic import ConfigDict, TypeAdapter, create_model
+from app.database.database import get_async_db
 from app.database.crud import (
     get_posts, get_post, get_post_by_slug, create_post, 
-    update_post, delete_post, get_posts_by_author, search_posts
+    update_post, delete_post, get_posts_by_author, search_posts,
+    get_post_version, get_post_version_by_slug
 )
 from app.schemas.schemas import PostCreate, PostUpdate, PostResponse, PostSummary
-from app.core.dependencies import get_current_active_user
-from app.models.models import User
+from app.core.dependencies import get_current_active_user, sparse_fields
+from app.models.models import Post
+from app.core.principals import Principal
+from app.utils.helpers import make_etag, etag_matches
+from app.core.cache import CachedResponse, cache_response
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
+post_summaries = TypeAdapter(List[PostSummary])
+
+SUMMARY_FIELDS = tuple(PostSummary.model_fields)
+
+# Post columns each PostSummary field is read from
+SUMMARY_COLUMNS = {
+    "id": Post.id,
+    "title": Post.title,
+    "slug": Post.slug,
+    "is_published": Post.is_published,
+    "created_at": Post.created_at,
+    "author": Post.author_id,
+}
+
+def dump_post_summaries(posts: List[Post]) -> bytes:
+    """Serialize posts to a JSON list of PostSummary."""
+    return post_summaries.dump_json(post_summaries.validate_python(posts, from_attributes=True))
+
+@lru_cache(maxsize=None)
+def partial_summaries(fields: Tuple[str, ...]) -> TypeAdapter:
+    """TypeAdapter for a list of PostSummary narrowed to `fields`."""
+    model = create_model(
+        "PostSummary",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (PostSummary.model_fields[name].annotation, ...) for name in fields}
+    )
+    return TypeAdapter(List[model])
+
+def dump_partial_summaries(posts: List[Post], fields: Tuple[str, ...]) -> bytes:
+    """Serialize only `fields` of each post's PostSummary."""
+    adapter = partial_summaries(fields)
+    return adapter.dump_json(adapter.validate_python(posts, from_attributes=True))
+
 @router.get("/", response_model=List[PostSummary])
-def read_posts(
+async def read_posts(
     skip: int = 0,
     limit: int = 100,
     published_only: bool = Query(True, description="Show only published posts"),
-    db: Session = Depends(get_db)
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(SUMMARY_FIELDS)),
+    db: AsyncSession = Depends(get_async_db),
+    cached: CachedResponse = Depends(cache_response("posts", "users"))
 ):
     """Get list of posts."""
-    posts = get_posts(db, skip=skip, limit=limit, published_only=published_only)
-    return posts
+    if cached.response is not None:
+        return cached.response
+    # Summaries never include the content, so it is never loaded
+    columns = [SUMMARY_COLUMNS[name] for name in fields or SUMMARY_FIELDS]
+    posts = await get_posts(
+        db, skip=skip, limit=limit, published_only=published_only,
+        columns=columns, with_author=fields is None or "author" in fields
+    )
+    if fields is None:
+        return cached.store(dump_post_summaries(posts))
+    return cached.store(dump_partial_summaries(posts, fields))
 
 @router.get("/search", response_model=List[PostSummary])
-def search_posts_endpoint(
+async def search_posts_endpoint(
     q: str = Query(..., description="Search query"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    cached: CachedResponse = Depends(cache_response("posts", "users"))
 ):
     """Search posts by title or content."""
-    posts = search_posts(db, query=q, skip=skip, limit=limit)
-    return posts
+    if cached.response is not None:
+        return cached.response
+    posts = await search_posts(db, query=q, skip=skip, limit=limit)
+    return cached.store(dump_post_summaries(posts))
 
 @router.get("/my-posts", response_model=List[PostSummary])
-def read_my_posts(
+async def read_my_posts(
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's posts."""
-    posts = get_posts_by_author(db, author_id=current_user.id, skip=skip, limit=limit)
+    posts = await get_posts_by_author(db, author_id=current_user.id, skip=skip, limit=limit)
     return posts
 
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
-def create_new_post(
+async def create_new_post(
     post: PostCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new post."""
-    return create_post(db=db, post=post, author_id=current_user.id)
+    return await create_post(db=db, post=post, author_id=current_user.id)
+
+def post_etag(post_id: int, post_version, author_id: int, author_version) -> str:
+    """ETag of a PostResponse; it embeds the author, so their version counts too."""
+    return make_etag("post", post_id, post_version, author_id, author_version)
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
 @router.get("/{post_id}", response_model=PostResponse)
-def read_post(post_id: int, db: Session = Depends(get_db)):
+async def read_post(
+    post_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get post by ID."""
-    post = get_post(db, post_id=post_id)
+    if if_none_match:
+        version = await get_post_version(db, post_id=post_id)
+        if not version:
+            raise HTTPException(status_code=404, detail="Post not found")
+        etag = post_etag(*version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    post = await get_post(db, post_id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    response.headers["ETag"] = post_etag(
+        post.id, post.updated_at or post.created_at,
+        post.author_id, post.author.updated_at or post.author.created_at
+    )
     return post
 
 @router.get("/slug/{slug}", response_model=PostResponse)
-def read_post_by_slug(slug: str, db: Session = Depends(get_db)):
+async def read_post_by_slug(
+    slug: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get post by slug."""
-    post = get_post_by_slug(db, slug=slug)
+    if if_none_match:
+        version = await get_post_version_by_slug(db, slug=slug)
+        if not version:
+            raise HTTPException(status_code=404, detail="Post not found")
+        etag = post_etag(*version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    post = await get_post_by_slug(db, slug=slug)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    response.headers["ETag"] = post_etag(
+        post.id, post.updated_at or post.created_at,
+        post.author_id, post.author.updated_at or post.author.created_at
+    )
     return post
 
 @router.put("/{post_id}", response_model=PostResponse)
-def update_post_endpoint(
+async def update_post_endpoint(
     post_id: int,
     post_update: PostUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a post."""
     # Check if post exists and user owns it
-    existing_post = get_post(db, post_id=post_id)
+    existing_post = await get_post(db, post_id=post_id)
     if not existing_post:
         raise HTTPException(status_code=404, detail="Post not found")
     
     if existing_post.author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    updated_post = update_post(db, post_id=post_id, post_update=post_update)
+    updated_post = await update_post(db, post_id=post_id, post_update=post_update)
     return updated_post
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post_endpoint(
+async def delete_post_endpoint(
     post_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a post."""
     # Check if post exists and user owns it
-    existing_post = get_post(db, post_id=post_id)
+    existing_post = await get_post(db, post_id=post_id)
     if not existing_post:
         raise HTTPException(status_code=404, detail="Post not found")
     
     if existing_post.author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    success = delete_post(db, post_id=post_id)
+    success = await delete_post(db, post_id=post_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete post")
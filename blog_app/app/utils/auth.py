@@ -2,11 +2,21 @@ from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+import asyncio
+import multiprocessing
+import time
 from app.core.config import settings
+from app.core.cache import TTLCache
 
 # Password hasher using Argon2
-ph = PasswordHasher()
+ph = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -20,6 +30,68 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return ph.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; if it matches a hash made with other Argon2
+    parameters, also return a new hash with the current ones."""
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if ph.check_needs_rehash(hashed_password):
+        return True, ph.hash(plain_password)
+    return True, None
+
+# Argon2 takes tens of milliseconds of CPU per call. It runs in its own worker
+# processes, so a burst of logins neither holds the event loop or the
+# threadpool nor competes for the GIL. At most password_workers calls are in
+# flight; the rest wait up to password_queue_timeout for a slot.
+
+class PasswordWorkersBusy(Exception):
+    """No password worker became free within password_queue_timeout."""
+
+_password_pool: Optional[ProcessPoolExecutor] = None
+_password_slots = asyncio.Semaphore(settings.password_workers)
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        # Spawned, not forked: the server process has driver and threadpool threads
+        _password_pool = ProcessPoolExecutor(
+            max_workers=settings.password_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _password_pool
+
+def shutdown_password_pool() -> None:
+    """Stop the password worker processes."""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(cancel_futures=True)
+        _password_pool = None
+
+async def _run_password_task(function: Callable[..., Any], *args: Any) -> Any:
+    global _password_pool
+    try:
+        await asyncio.wait_for(_password_slots.acquire(), timeout=settings.password_queue_timeout)
+    except asyncio.TimeoutError:
+        raise PasswordWorkersBusy()
+    try:
+        pool = _get_password_pool()
+        return await asyncio.get_running_loop().run_in_executor(pool, function, *args)
+    except BrokenProcessPool:
+        # A worker died (killed, out of memory); start a fresh pool for the next call
+        if _password_pool is pool:
+            _password_pool = None
+        raise
+    finally:
+        _password_slots.release()
+
+async def hash_password(password: str) -> str:
+    """Hash a password in a password worker."""
+    return await _run_password_task(get_password_hash, password)
+
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password in a password worker."""
+    return await _run_password_task(verify_and_update_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create access token."""
     to_encode = data.copy()
@@ -32,13 +104,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+# Subjects of successfully decoded tokens, each kept until its token expires
+decoded_tokens = (
+    TTLCache(max_size=settings.token_cache_size, ttl=settings.access_token_expire_minutes * 60)
+    if settings.token_cache_size > 0 else None
+)
+
 def verify_token(token: str) -> Optional[str]:
     """Verify and decode token."""
+    if decoded_tokens is not None:
+        username = decoded_tokens.get(token)
+        if username is not None:
+            return username
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         username: str = payload.get("sub")
         if username is None:
             return None
-        return username
     except JWTError:
         return None
+    if decoded_tokens is not None and payload.get("exp") is not None:
+        decoded_tokens.set(token, username, ttl=payload["exp"] - time.time())
+    return username
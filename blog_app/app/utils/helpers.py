@@ -1,5 +1,6 @@
+import hashlib
 import re
-from typing import Optional
+from typing import Any, Optional
 
 def create_slug(title: str) -> str:
     """Create a URL-friendly slug from title."""
@@ -19,3 +20,18 @@ def generate_unique_slug(title: str, existing_slugs: list = None) -> str:
         counter += 1
     
     return f"{base_slug}-{counter}"
+
+def make_etag(*parts: Any) -> str:
+    """Generate a strong ETag from the values identifying one version of a resource."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {
+        candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+    }
@@ -1,8 +1,17 @@
+from app.core.startup import StartupReport, FirstRequestMiddleware, use_precomputed_openapi, write_openapi
+
+# Started before the remaining imports so the report covers them
+startup_report = StartupReport()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from app.routers import auth, posts, users
 from app.database.database import async_engine
-from app.models.models import Base
+from app.database.migrations import upgrade_database, check_schema
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, METRICS_CONTENT_TYPE, render_metrics
+from app.utils.auth import PasswordWorkersBusy, shutdown_password_pool
 import asyncio
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
@@ -25,11 +34,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request duration, SQL count and SQL time, served on /metrics
+app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+
+# Time from process start to the first request, served on /startup
+app.add_middleware(FirstRequestMiddleware, report=startup_report)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(posts.router)
 app.include_router(users.router)
 
+@app.exception_handler(PasswordWorkersBusy)
+async def password_workers_busy(request, exc):
+    """Too many logins and registrations in flight."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+startup_report.mark("import")
+
 async def create_database_if_not_exists():
     """Create database if it doesn't exist."""
     try:
@@ -49,11 +75,25 @@ async def create_database_if_not_exists():
 
 @app.on_event("startup")
 async def startup_event():
-    """Create database and tables on startup."""
-    await create_database_if_not_exists()
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("Database tables created successfully!")
+    """Migrate or check the database schema, per settings.startup_mode."""
+    if settings.startup_mode == "migrate":
+        await create_database_if_not_exists()
+        async with async_engine.begin() as conn:
+            await conn.run_sync(upgrade_database)
+        print("Database migrated to the latest revision!")
+    elif settings.startup_mode == "check":
+        async with async_engine.connect() as conn:
+            await conn.run_sync(check_schema)
+    startup_report.mark("database")
+
+    use_precomputed_openapi(app, settings.openapi_path)
+    startup_report.mark("openapi")
+    startup_report.finish()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the password worker processes."""
+    shutdown_password_pool()
 
 @app.get("/")
 async def root():
@@ -69,6 +109,22 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/startup", include_in_schema=False)
+async def startup_stats():
+    """Startup phase timings and time to first request."""
+    return startup_report.as_dict()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import sys
+
+    # python main.py --write-openapi PATH precomputes the schema served with OPENAPI_PATH=PATH
+    if len(sys.argv) == 3 and sys.argv[1] == "--write-openapi":
+        write_openapi(app, sys.argv[2])
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
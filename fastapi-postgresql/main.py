@@ -1,3 +1,4 @@
+import os
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Annotated
@@ -7,7 +8,13 @@ from sqlalchemy.orm import Session
 
 
 app = FastAPI()
-models.Base.metadata.create_all(bind=engine)
+
+# Create tables when the server starts rather than on import; replicas pointed
+# at an existing database can set CREATE_TABLES=0 and never run DDL
+@app.on_event("startup")
+def create_tables():
+    if os.getenv('CREATE_TABLES', '1') != '0':
+        models.Base.metadata.create_all(bind=engine)
 
 class ChoiceBase(BaseModel):
     choice_text : str
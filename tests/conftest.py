@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when the app is imported, so point it at a scratch
+# database first; never at the checked-in fastapi_items.db
+_scratch = tempfile.mkdtemp(prefix="items-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}/items.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,22 @@
+def test_bulk_create_reports_row_with_non_integer_id(client):
+    response = client.post("/items/bulk", json=[{"id": "zz", "name": "a"}])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["processed"] == 0
+    assert [(error["index"], error["item_id"]) for error in body["errors"]] == [(0, None)]
+
+def test_bulk_update_reports_row_with_non_integer_id(client):
+    response = client.patch("/items/bulk", json=[{"id": "abc", "price": 1}])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["processed"] == 0
+    assert [(error["index"], error["item_id"]) for error in body["errors"]] == [(0, None)]
+    assert any(error["loc"] == ["id"] for error in body["errors"][0]["detail"])
+
+def test_bulk_update_keeps_integer_id_of_invalid_row(client):
+    response = client.patch("/items/bulk", json=[{"id": 7, "price": -1}])
+
+    assert response.status_code == 200
+    assert [error["item_id"] for error in response.json()["errors"]] == [7]
@@ -0,0 +1,29 @@
+import asyncio
+
+from app.dependencies import loader
+
+class SlowItems:
+    """Stands in for async_item_crud, answering after a short delay."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_items(self, db, item_ids):
+        self.calls.append(list(item_ids))
+        await asyncio.sleep(0.05)
+        return {item_id: f"item {item_id}" for item_id in item_ids}
+
+def test_cancelled_waiter_does_not_cancel_others_in_batch(monkeypatch):
+    items = SlowItems()
+    monkeypatch.setattr(loader, "async_item_crud", items)
+
+    async def run():
+        item_loader = loader.ItemLoader(db=None)
+        first = asyncio.ensure_future(item_loader.load(1))
+        second = asyncio.ensure_future(item_loader.load(1))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.wait_for(second, timeout=1), first.cancelled()
+
+    assert asyncio.run(run()) == ("item 1", True)
+    assert items.calls == [[1]]